@@ -3,112 +3,93 @@
 Demo script showing natural language usage of C2RTL verification
 """
 
-# Example natural language queries for C2RTL verification
+import sys
 
-queries = [
+# Example natural language queries for C2RTL verification, stored as
+# parallel tuples: _QUERY_STRS[i] is sent with context _QUERY_CTXS[i]
+_QUERY_STRS = (
     # Basic equivalence checking
+    "Check if adder.c and adder.v are equivalent",
+    
+    # With specific function/module names
+    "Verify that function add_sat in adder.c matches module adder_sat in adder.v",
+    
+    # Property mining
+    "Find all properties in the FIR filter implementation",
+    
+    # Coverage analysis
+    "What's the branch coverage of my verification?",
+    
+    # Debugging with previous result
+    "Debug why the last verification failed",
+    
+    # Advanced verification
+    "Run bounded model checking with depth 100 on the adder",
+    
+    # K-induction proof
+    "Prove correctness using k-induction with k=5",
+    
+    # Report generation
+    "Generate an HTML report of all verifications",
+    
+    # Method selection
+    "Check equivalence using SymbiYosys",
+    
+    # Complex workflow
+    "Verify the filter, check coverage, and generate a report"
+)
+
+_QUERY_CTXS = (
     {
-        "query": "Check if adder.c and adder.v are equivalent",
-        "context": {
-            "c_files": ["adder.c"],
-            "rtl_files": ["adder.v"]
-        }
+        "c_files": ["adder.c"],
+        "rtl_files": ["adder.v"]
     },
     
-    # With specific function/module names
     {
-        "query": "Verify that function add_sat in adder.c matches module adder_sat in adder.v",
-        "context": {
-            "c_files": ["adder.c"],
-            "rtl_files": ["adder.v"]
-        }
+        "c_files": ["adder.c"],
+        "rtl_files": ["adder.v"]
     },
     
-    # Property mining
     {
-        "query": "Find all properties in the FIR filter implementation",
-        "context": {
-            "c_files": ["fir_filter.c"],
-            "rtl_files": ["fir_filter.v"]
-        }
+        "c_files": ["fir_filter.c"],
+        "rtl_files": ["fir_filter.v"]
     },
     
-    # Coverage analysis
     {
-        "query": "What's the branch coverage of my verification?",
-        "context": {
-            "c_files": ["fir_filter.c"],
-            "rtl_files": ["fir_filter.v"]
-        }
+        "c_files": ["fir_filter.c"],
+        "rtl_files": ["fir_filter.v"]
     },
     
-    # Debugging with previous result
     {
-        "query": "Debug why the last verification failed",
-        "context": {
-            "verification_ids": ["verify_20250109_143022"]
-        }
+        "verification_ids": ["verify_20250109_143022"]
     },
     
-    # Advanced verification
     {
-        "query": "Run bounded model checking with depth 100 on the adder",
-        "context": {
-            "c_files": ["adder.c"],
-            "rtl_files": ["adder.v"]
-        }
+        "c_files": ["adder.c"],
+        "rtl_files": ["adder.v"]
     },
     
-    # K-induction proof
     {
-        "query": "Prove correctness using k-induction with k=5",
-        "context": {
-            "c_files": ["adder.c"],
-            "rtl_files": ["adder.v"]
-        }
+        "c_files": ["adder.c"],
+        "rtl_files": ["adder.v"]
     },
     
-    # Report generation
     {
-        "query": "Generate an HTML report of all verifications",
-        "context": {
-            "verification_ids": []  # Will use all available
-        }
+        "verification_ids": []  # Will use all available
     },
     
-    # Method selection
     {
-        "query": "Check equivalence using SymbiYosys",
-        "context": {
-            "c_files": ["fir_filter.c"],
-            "rtl_files": ["fir_filter.v"]
-        }
+        "c_files": ["fir_filter.c"],
+        "rtl_files": ["fir_filter.v"]
     },
     
-    # Complex workflow
     {
-        "query": "Verify the filter, check coverage, and generate a report",
-        "context": {
-            "c_files": ["fir_filter.c"],
-            "rtl_files": ["fir_filter.v"]
-        }
+        "c_files": ["fir_filter.c"],
+        "rtl_files": ["fir_filter.v"]
     }
-]
-
-# Print examples
-print("C2RTL Natural Language Query Examples")
-print("=" * 50)
-
-for i, example in enumerate(queries, 1):
-    print(f"\nExample {i}:")
-    print(f"Query: {example['query']}")
-    print(f"Context: {example['context']}")
-    print("-" * 30)
+)
 
 # Advanced examples with explanations
-print("\n\nAdvanced Usage Patterns")
-print("=" * 50)
-
 advanced_examples = [
     {
         "pattern": "Specific depth/bound",
@@ -146,15 +127,8 @@ advanced_examples = [
     }
 ]
 
-for category in advanced_examples:
-    print(f"\n{category['pattern']}:")
-    for example in category['examples']:
-        print(f"  • {example}")
-
 # Interactive example
-print("\n\nInteractive Workflow Example")
-print("=" * 50)
-print("""
+WORKFLOW_EXAMPLE = """
 User: "Check if my adder works correctly"
 Assistant: Uses c2rtl_natural_language → c2rtl_equivalence
 
@@ -166,20 +140,36 @@ Assistant: Uses c2rtl_debug with analysis_type="minimize"
 
 User: "Generate a report of what we found"
 Assistant: Uses c2rtl_natural_language → c2rtl_report
-""")
+"""
 
 # Tips
-print("\nTips for Natural Language Queries")
-print("=" * 50)
-print("""
+TIPS = """
 1. Be conversational - the system understands context
 2. Reference previous results naturally
 3. Combine multiple operations in one query
 4. Ask for clarification if needed
 5. Use specific names when you know them
 6. The system learns from context
-""")
+"""
+
+# The demo text is formatted once at import and written in one go
+_lines = ["C2RTL Natural Language Query Examples\n", "=" * 50 + "\n"]
+_lines += [
+    f"\nExample {i}:\nQuery: {query}\nContext: {context}\n{'-' * 30}\n"
+    for i, (query, context) in enumerate(zip(_QUERY_STRS, _QUERY_CTXS), 1)
+]
+_lines += ["\n\nAdvanced Usage Patterns\n", "=" * 50 + "\n"]
+_lines += [
+    f"\n{category['pattern']}:\n" + "".join(f"  • {example}\n" for example in category['examples'])
+    for category in advanced_examples
+]
+_lines += ["\n\nInteractive Workflow Example\n", "=" * 50 + "\n", WORKFLOW_EXAMPLE + "\n"]
+_lines += ["\nTips for Natural Language Queries\n", "=" * 50 + "\n", TIPS + "\n"]
+_lines += [
+    "\nThis demo shows example queries. In real usage,\n",
+    "these would be sent to the C2RTL MCP server.\n"
+]
+_DEMO = "".join(_lines)
 
 if __name__ == "__main__":
-    print("\nThis demo shows example queries. In real usage,")
-    print("these would be sent to the C2RTL MCP server.")
\ No newline at end of file
+    sys.stdout.write(_DEMO)
@@ -5,17 +5,25 @@ Formal verification between C and RTL with advanced features
 """
 
 import asyncio
+import collections
+import contextlib
+import hashlib
+import itertools
 import json
 import logging
-import subprocess
+import mmap
 import tempfile
 import os
 import sys
 import re
+import signal
+import time
+import uuid
 import datetime
+import functools
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Configure logging
@@ -35,13 +43,53 @@ except ImportError as e:
     logger.error(f"Error importing MCP modules: {e}")
     sys.exit(1)
 
+# Aho-Corasick keyword matching is optional; a compiled regex is used otherwise
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Initialize MCP server
 server = Server("c2rtl-verify-mcp")
 
-# Verification result storage
-verification_results = {}
+# Verification result storage; only the most recent results stay in memory
+verification_results: "collections.OrderedDict[str, VerificationResult]" = collections.OrderedDict()
 verification_history = []
 
+# Verification IDs: a per-process tag keeps spilled results from earlier runs
+# distinct, and the counter keeps concurrent requests distinct
+_SESSION_ID = uuid.uuid4().hex[:6]
+_verify_counter = itertools.count()
+
+# Tool output kept in memory per stream; full stdout is spilled to LOG_DIR. Logs
+# older than LOG_MAX_AGE seconds, and all but the newest LOG_MAX_FILES, are pruned
+# at startup and every LOG_PRUNE_EVERY commands
+OUTPUT_TAIL_LINES = 4096
+LOG_DIR = Path(tempfile.gettempdir()) / "c2rtl-logs"
+LOG_MAX_AGE = 24 * 3600
+LOG_MAX_FILES = 512
+LOG_PRUNE_EVERY = 64
+_commands_run = itertools.count(1)
+
+# Results memoized by input contents, in memory and on disk
+CACHE_DIR = Path(os.environ.get("C2RTL_CACHE_DIR", "~/.c2rtl_cache")).expanduser()
+
+# Older verification results are spilled here once the in-memory store is full
+RESULTS_DIR = CACHE_DIR / "results"
+MAX_RESULTS_IN_MEMORY = 256
+
+# Results serializing to more than this are served as compact JSON
+PRETTY_JSON_LIMIT = 16 * 1024
+_verify_cache: Dict[str, Dict[str, Any]] = {}
+
+# Serializes Verilator builds that share a build directory
+_build_locks: Dict[str, asyncio.Lock] = {}
+
+# Warm SMT solvers for the smt-pool method; any SMT-LIB2 solver that reads
+# commands incrementally from stdin can be substituted
+SMT_SOLVER_CMD = os.environ.get("C2RTL_SMT_SOLVER", "boolector --smt2 --incremental").split()
+SOLVER_POOL_SIZE = 4
+
 class VerificationStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -60,88 +108,388 @@ class VerificationResult:
     result: Dict[str, Any]
     counterexample: Optional[str] = None
     coverage: Optional[float] = None
+    cached_json: Optional[str] = None
+    # Derived from the paths once, so listings and reports don't re-split them
+    c_basename: str = field(init=False, default="")
+    rtl_basename: str = field(init=False, default="")
     
-def run_command(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300) -> Dict[str, Any]:
-    """Execute command and return results"""
+    def __post_init__(self):
+        self.c_basename = os.path.basename(self.c_file or "")
+        self.rtl_basename = os.path.basename(self.rtl_file or "")
+
+async def drain_stream(stream: asyncio.StreamReader, log_file=None) -> str:
+    """Read a pipe to EOF, keeping only its tail and optionally spilling all of it"""
+    tail = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    partial = b""
+    # Fixed-size reads, so no line is too long for the stream's buffer limit
+    while True:
+        chunk = await stream.read(1 << 16)
+        if not chunk:
+            break
+        if log_file is not None:
+            log_file.write(chunk)
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        tail.extend(line + b"\n" for line in lines)
+    if partial:
+        tail.append(partial)
+    return b"".join(tail).decode(errors="replace")
+
+def prune_logs() -> None:
+    """Remove spilled stdout logs beyond LOG_MAX_AGE or LOG_MAX_FILES"""
+    cutoff = time.time() - LOG_MAX_AGE
+    try:
+        logs = sorted(LOG_DIR.glob("stdout-*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for i, path in enumerate(logs):
+        try:
+            if i >= LOG_MAX_FILES or path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to prune {path}: {e}")
+
+def log_note(result: Dict[str, Any]) -> str:
+    """Pointer to a command's full stdout; left out of cached replies, which outlive the logs"""
+    return f"\n(full log at {result.get('stdout_path', 'n/a')})"
+
+async def kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """Kill a command and everything it spawned, then reap it"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    await proc.wait()
+
+async def run_command(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300) -> Dict[str, Any]:
+    """Execute command without blocking the event loop and return output tails"""
     try:
         logger.info(f"Running: {' '.join(cmd)}")
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=cwd,
-            timeout=timeout
+            limit=1 << 20,
+            start_new_session=True
         )
-        return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode
-        }
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": f"Command timed out after {timeout}s"}
     except Exception as e:
         return {"success": False, "error": str(e)}
+    
+    if next(_commands_run) % LOG_PRUNE_EVERY == 0:
+        prune_logs()
+    
+    # Only the tails stay in memory; the full stdout goes to stdout_path
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=LOG_DIR, prefix="stdout-", suffix=".log", delete=False) as log_file:
+        # Awaited from a coroutine so that, when cancelled, the gather's outcome is consumed
+        async def collect():
+            return await asyncio.gather(
+                drain_stream(proc.stdout, log_file),
+                drain_stream(proc.stderr),
+                proc.wait()
+            )
+        
+        try:
+            stdout, stderr, _ = await asyncio.wait_for(collect(), timeout=timeout)
+        except asyncio.TimeoutError:
+            await kill_process_group(proc)
+            return {
+                "success": False,
+                "error": f"Command timed out after {timeout}s",
+                "stdout_path": log_file.name
+            }
+        except asyncio.CancelledError:
+            await kill_process_group(proc)
+            raise
+        except Exception as e:
+            await kill_process_group(proc)
+            return {
+                "success": False,
+                "error": f"Reading command output failed: {e}",
+                "stdout_path": log_file.name
+            }
+    
+    return {
+        "success": proc.returncode == 0,
+        "stdout": stdout,
+        "stderr": stderr,
+        "stdout_path": log_file.name,
+        "returncode": proc.returncode
+    }
 
-@server.list_resources()
-async def list_resources() -> List[types.Resource]:
-    """List available verification results as resources"""
-    resources = []
-    
-    # Add verification results
-    for result_id, result in verification_results.items():
-        resources.append(types.Resource(
-            uri=f"verification://result/{result_id}",
-            name=f"Verification: {os.path.basename(result.c_file)} vs {os.path.basename(result.rtl_file)}",
-            mimeType="application/json",
-            description=f"Status: {result.status.value}, Method: {result.method}"
-        ))
-    
-    # Add verification guides
-    resources.extend([
-        types.Resource(
-            uri="guide://c2rtl/best-practices",
-            name="C2RTL Verification Best Practices",
-            mimeType="text/markdown",
-            description="Guidelines for effective C-to-RTL verification"
-        ),
-        types.Resource(
-            uri="guide://c2rtl/hls-verification",
-            name="HLS Verification Guide",
-            mimeType="text/markdown",
-            description="Comprehensive guide for HLS verification flows"
-        ),
-        types.Resource(
-            uri="guide://c2rtl/assertion-patterns",
-            name="Assertion Pattern Library",
-            mimeType="text/markdown",
-            description="Common assertion patterns for hardware verification"
+class PooledSolver:
+    """A long-lived SMT-LIB2 solver process driven over its stdin/stdout"""
+    
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+    
+    @classmethod
+    async def start(cls, cmd: List[str]) -> "PooledSolver":
+        logger.info(f"Starting solver: {' '.join(cmd)}")
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=1 << 20
         )
-    ])
+        return cls(proc)
+    
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+    
+    async def send(self, text: str):
+        self.proc.stdin.write(text.encode())
+        await self.proc.stdin.drain()
+    
+    async def check_sat(self, timeout: int = 300) -> str:
+        """Issue (check-sat) and wait for sat/unsat/unknown, skipping any chatter"""
+        await self.send("(check-sat)\n")
+        while True:
+            line = await asyncio.wait_for(self.proc.stdout.readline(), timeout)
+            if not line:
+                raise RuntimeError("solver exited unexpectedly")
+            answer = line.decode(errors="replace").strip()
+            if answer in ("sat", "unsat", "unknown"):
+                return answer
+            if answer.startswith("(error"):
+                raise RuntimeError(answer)
+    
+    def kill(self):
+        if self.alive:
+            self.proc.kill()
+
+class SolverPool:
+    """Up to `size` warm solver processes, each query scoped by push/pop"""
+    
+    def __init__(self, cmd: List[str], size: int):
+        self.cmd = cmd
+        self.idle: List[PooledSolver] = []
+        self.slots = asyncio.Semaphore(size)
+    
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        async with self.slots:
+            solver = None
+            while self.idle and solver is None:
+                candidate = self.idle.pop()
+                solver = candidate if candidate.alive else None
+            if solver is None:
+                solver = await PooledSolver.start(self.cmd)
+            
+            # Anything the caller declares is dropped again by the matching pop,
+            # so a solver that completed cleanly goes back to the pool as it was
+            healthy = False
+            try:
+                await solver.send("(push 1)\n")
+                yield solver
+                healthy = True
+            finally:
+                if healthy and solver.alive:
+                    await solver.send("(pop 1)\n")
+                    self.idle.append(solver)
+                else:
+                    solver.kill()
+
+_solver_pool = SolverPool(SMT_SOLVER_CMD, SOLVER_POOL_SIZE)
+
+def cache_key(files: List[Optional[str]], params: List[Any]) -> str:
+    """Hash input file contents together with the tool parameters"""
+    h = hashlib.sha256()
+    for path in files:
+        if path:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        h.update(b"\0")
+    h.update(json.dumps(params).encode())
+    return h.hexdigest()
+
+def _cache_load(key: str) -> Optional[Dict[str, Any]]:
+    """Fetch a cache entry from memory, falling back to disk"""
+    entry = _verify_cache.get(key)
+    if entry is None:
+        try:
+            with open(CACHE_DIR / f"{key}.json") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if isinstance(entry, list):
+            # Entries written before verdicts were stored alongside the text
+            entry = {"texts": entry, "status": None}
+        _verify_cache[key] = entry
+    return entry
+
+def cache_get(files: List[Optional[str]], params: List[Any]) -> Tuple[Optional[str], Optional[List[types.TextContent]]]:
+    """Return the cache key and any stored result for these inputs"""
+    try:
+        key = cache_key(files, params)
+    except OSError:
+        return None, None
+    
+    entry = _cache_load(key)
+    if entry is None:
+        return key, None
+    
+    logger.info(f"Cache hit for {files}")
+    return key, [types.TextContent(type="text", text=text) for text in entry["texts"]]
+
+def cache_get_verdict(
+    files: List[Optional[str]], params: List[Any]
+) -> Tuple[Optional[str], Optional[VerificationStatus], Optional[List[types.TextContent]]]:
+    """Like cache_get, for results that were stored with a verification status"""
+    try:
+        key = cache_key(files, params)
+    except OSError:
+        return None, None, None
+    
+    entry = _cache_load(key)
+    if entry is None or entry.get("status") is None:
+        return key, None, None
     
+    logger.info(f"Cache hit for {files}")
+    contents = [types.TextContent(type="text", text=text) for text in entry["texts"]]
+    return key, VerificationStatus(entry["status"]), contents
+
+def cache_put(
+    key: Optional[str], contents: List[types.TextContent],
+    status: Optional[VerificationStatus] = None
+) -> None:
+    """Store a result under a key from cache_get"""
+    if key is None:
+        return
+    entry = {"texts": [c.text for c in contents], "status": status.value if status else None}
+    _verify_cache[key] = entry
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_DIR / f"{key}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, CACHE_DIR / f"{key}.json")
+    except OSError as e:
+        logger.warning(f"Failed to write result cache: {e}")
+
+def _file_contains(path: str, pattern: bytes) -> bool:
+    """Regex search over a memory-mapped file, without reading it into memory"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return re.search(pattern, m) is not None
+
+def _precheck(c_file: Optional[str], c_function: Optional[str],
+              rtl_file: Optional[str], rtl_module: Optional[str]) -> Optional[str]:
+    """Cheap sanity checks run before any tool is launched; returns the problem, if any"""
+    for path in (c_file, rtl_file):
+        if not path or not os.path.isfile(path):
+            return f"File not found: {path}"
+    if c_function and not _file_contains(c_file, rb"\b" + re.escape(c_function.encode()) + rb"\s*\("):
+        return f"Function {c_function} not found in {c_file}"
+    if rtl_module and not _file_contains(rtl_file, rb"\bmodule\s+" + re.escape(rtl_module.encode()) + rb"\b"):
+        return f"Module {rtl_module} not found in {rtl_file}"
+    return None
+
+_RE_CPROVER_STATUS = re.compile(r'"cProverStatus"\s*:\s*"(\w+)"')
+
+def parse_cbmc_status(stdout: str) -> VerificationStatus:
+    """Read the verdict from CBMC's --json-ui cProverStatus message"""
+    # The status message is the last one CBMC prints, so search from the end
+    for match in reversed(list(_RE_CPROVER_STATUS.finditer(stdout))):
+        if match.group(1) == "success":
+            return VerificationStatus.PASSED
+        if match.group(1) == "failure":
+            return VerificationStatus.FAILED
+        break
+    return VerificationStatus.ERROR
+
+def result_to_dict(result: VerificationResult) -> Dict[str, Any]:
+    """JSON-serializable form of a verification result"""
+    return {
+        "id": result.id,
+        "timestamp": result.timestamp,
+        "c_file": result.c_file,
+        "rtl_file": result.rtl_file,
+        "method": result.method,
+        "status": result.status.value,
+        "result": result.result,
+        "counterexample": result.counterexample,
+        "coverage": result.coverage
+    }
+
+def serialize_result(result: VerificationResult) -> str:
+    """Resource text for a result: indented when small, compact when large"""
+    data = result_to_dict(result)
+    text = json.dumps(data, separators=(',', ':'))
+    if len(text) < PRETTY_JSON_LIMIT:
+        text = json.dumps(data, indent=2)
+    return text
+
+def _result_resource(result: VerificationResult) -> types.Resource:
+    return types.Resource(
+        uri=f"verification://result/{result.id}",
+        name=f"Verification: {result.c_basename} vs {result.rtl_basename}",
+        mimeType="application/json",
+        description=f"Status: {result.status.value}, Method: {result.method}"
+    )
+
+def _archived_resource(result_id: str) -> types.Resource:
+    return types.Resource(
+        uri=f"verification://result/{result_id}",
+        name=f"Verification: {result_id}",
+        mimeType="application/json",
+        description="Archived verification result"
+    )
+
+def _scan_archived_resources() -> Dict[str, types.Resource]:
+    """Resources for results spilled to disk, including by earlier runs"""
+    resources = {}
+    if RESULTS_DIR.is_dir():
+        for entry in os.scandir(RESULTS_DIR):
+            if entry.name.endswith(".json"):
+                result_id = entry.name[:-len(".json")]
+                resources[result_id] = _archived_resource(result_id)
     return resources
 
-@server.read_resource()
-async def read_resource(uri: str) -> str:
-    """Read a specific resource"""
-    if uri.startswith("verification://result/"):
-        result_id = uri.split("/")[-1]
-        if result_id in verification_results:
-            result = verification_results[result_id]
-            return json.dumps({
-                "id": result.id,
-                "timestamp": result.timestamp,
-                "c_file": result.c_file,
-                "rtl_file": result.rtl_file,
-                "method": result.method,
-                "status": result.status.value,
-                "result": result.result,
-                "counterexample": result.counterexample,
-                "coverage": result.coverage
-            }, indent=2)
-    
-    elif uri == "guide://c2rtl/best-practices":
-        return """# C2RTL Verification Best Practices
+# Result resources by ID, kept in step with the store so listing never rebuilds them;
+# spilled results are listed by ID only and loaded when read
+_resource_cache: Dict[str, types.Resource] = _scan_archived_resources()
+
+def store_verification_result(result: VerificationResult) -> None:
+    """Record a result, spilling the oldest ones to disk past MAX_RESULTS_IN_MEMORY"""
+    # Serialized once per store so resource reads never re-encode the result
+    result.cached_json = serialize_result(result)
+    verification_results[result.id] = result
+    verification_results.move_to_end(result.id)
+    _resource_cache[result.id] = _result_resource(result)
+    while len(verification_results) > MAX_RESULTS_IN_MEMORY:
+        _, evicted = verification_results.popitem(last=False)
+        try:
+            RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+            with open(RESULTS_DIR / f"{evicted.id}.json", 'w') as f:
+                json.dump(result_to_dict(evicted), f)
+            _resource_cache[evicted.id] = _archived_resource(evicted.id)
+        except OSError as e:
+            _resource_cache.pop(evicted.id, None)
+            logger.warning(f"Failed to spill verification result {evicted.id}: {e}")
+
+def get_verification_result(result_id: str) -> Optional[VerificationResult]:
+    """Look a result up in memory, then among the spilled ones on disk"""
+    if result_id in verification_results:
+        return verification_results[result_id]
+    try:
+        with open(RESULTS_DIR / f"{os.path.basename(result_id)}.json") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    data["status"] = VerificationStatus(data["status"])
+    result = VerificationResult(**data)
+    result.cached_json = serialize_result(result)
+    return result
+
+# Guide documents exposed as resources
+_BEST_PRACTICES_MD = """# C2RTL Verification Best Practices
 
 ## 1. Input/Output Mapping
 - Clearly define the mapping between C function arguments and RTL ports
@@ -168,9 +516,8 @@ async def read_resource(uri: str) -> str:
 - Use bounded model checking for initial verification
 - Apply k-induction for unbounded verification
 - Generate random tests for coverage"""
-    
-    elif uri == "guide://c2rtl/hls-verification":
-        return """# HLS Verification Guide
+
+_HLS_VERIFICATION_MD = """# HLS Verification Guide
 
 ## Verification Levels
 
@@ -214,9 +561,8 @@ i++ -march=x86-64 --component function_name
 legup function.c
 make verify
 ```"""
-    
-    elif uri == "guide://c2rtl/assertion-patterns":
-        return """# Assertion Pattern Library
+
+_ASSERTION_PATTERNS_MD = """# Assertion Pattern Library
 
 ## Safety Properties
 
@@ -263,6 +609,52 @@ property outputs_match;
     (c_valid && rtl_valid) |-> (c_output == rtl_output);
 endproperty
 ```"""
+
+# Static guide resources, served by URI
+_GUIDES: Dict[str, str] = {
+    "guide://c2rtl/best-practices": _BEST_PRACTICES_MD,
+    "guide://c2rtl/hls-verification": _HLS_VERIFICATION_MD,
+    "guide://c2rtl/assertion-patterns": _ASSERTION_PATTERNS_MD
+}
+
+# Guide resources never change, so they are built once
+_STATIC_GUIDE_RESOURCES = [
+    types.Resource(
+        uri="guide://c2rtl/best-practices",
+        name="C2RTL Verification Best Practices",
+        mimeType="text/markdown",
+        description="Guidelines for effective C-to-RTL verification"
+    ),
+    types.Resource(
+        uri="guide://c2rtl/hls-verification",
+        name="HLS Verification Guide",
+        mimeType="text/markdown",
+        description="Comprehensive guide for HLS verification flows"
+    ),
+    types.Resource(
+        uri="guide://c2rtl/assertion-patterns",
+        name="Assertion Pattern Library",
+        mimeType="text/markdown",
+        description="Common assertion patterns for hardware verification"
+    )
+]
+
+@server.list_resources()
+async def list_resources() -> List[types.Resource]:
+    """List available verification results as resources"""
+    return list(_resource_cache.values()) + _STATIC_GUIDE_RESOURCES
+
+@server.read_resource()
+async def read_resource(uri: str) -> str:
+    """Read a specific resource"""
+    if uri in _GUIDES:
+        return _GUIDES[uri]
+    
+    if uri.startswith("verification://result/"):
+        result_id = uri.split("/")[-1]
+        result = get_verification_result(result_id)
+        if result is not None:
+            return result.cached_json or serialize_result(result)
     
     return "Resource not found"
 
@@ -294,7 +686,7 @@ async def list_tools() -> List[types.Tool]:
                     },
                     "method": {
                         "type": "string",
-                        "enum": ["cbmc-hw", "yosys-sby", "verilator-cbmc", "symbiyosys"],
+                        "enum": ["cbmc-hw", "yosys-sby", "verilator-cbmc", "symbiyosys", "smt-pool"],
                         "description": "Verification method",
                         "default": "verilator-cbmc"
                     },
@@ -361,6 +753,19 @@ async def list_tools() -> List[types.Tool]:
                         "type": "string",
                         "enum": ["invariants", "relationships", "temporal", "all"],
                         "default": "all"
+                    },
+                    "verify": {
+                        "type": "boolean",
+                        "description": "Prove the mined properties against the RTL in one SymbiYosys run",
+                        "default": False
+                    },
+                    "rtl_module": {
+                        "type": "string",
+                        "description": "RTL module the properties are checked on (required with verify)"
+                    },
+                    "depth": {
+                        "type": "integer",
+                        "default": 20
                     }
                 },
                 "required": ["c_file", "rtl_file"]
@@ -454,42 +859,94 @@ async def list_tools() -> List[types.Tool]:
         )
     ]
 
+# Natural language patterns, compiled once at import
+_RE_CLAUSE_SPLIT = re.compile(r",\s*(?:and\s+|then\s+)?|\s+and\s+(?:then\s+)?|\s+then\s+")
+_RE_FUNC_PATTERNS = [re.compile(pattern) for pattern in (
+    r'function\s+["\']?(\w+)["\']?',
+    r'["\'](\w+)["\']?\s+function',
+    r'func\s+(\w+)',
+    r'(\w+)\s+in\s+\w+\.c'
+)]
+_RE_MOD_PATTERNS = [re.compile(pattern) for pattern in (
+    r'module\s+["\']?(\w+)["\']?',
+    r'["\'](\w+)["\']?\s+module',
+    r'mod\s+(\w+)',
+    r'(\w+)\s+in\s+\w+\.v'
+)]
+_RE_EQUIV_DEPTH = re.compile(r'depth\s+(\d+)')
+_RE_DEPTH = re.compile(r'depth\s+(\d+)|bound\s+(\d+)')
+_RE_K = re.compile(r'k\s*=\s*(\d+)')
+
+# Query keywords for each action; the first action in this list wins
+NL_ACTION_KEYWORDS = [
+    ("equivalence", ["equivalent", "same", "match", "compare", "equiv", "verify", "check if", "are these"]),
+    ("property_mining", ["properties", "property", "mine", "discover", "extract", "find", "invariant", "temporal", "relationship"]),
+    ("coverage", ["coverage", "covered", "test"]),
+    ("debug", ["debug", "why failed", "counterexample", "trace"]),
+    ("report", ["report", "summary", "results"]),
+    ("bmc", ["bounded", "bmc", "depth"]),
+    ("k_induction", ["induction", "inductive", "prove"])
+]
+_KEYWORD_ACTIONS = {word: action for action, words in NL_ACTION_KEYWORDS for word in words}
+
+if ahocorasick is not None:
+    _keyword_automaton = ahocorasick.Automaton()
+    for _word, _action in _KEYWORD_ACTIONS.items():
+        _keyword_automaton.add_word(_word, _action)
+    _keyword_automaton.make_automaton()
+else:
+    # Zero-width lookahead so keywords starting inside another match are still seen
+    _keyword_automaton = None
+    _RE_KEYWORDS = re.compile("(?=(%s))" % "|".join(
+        re.escape(word) for word in sorted(_KEYWORD_ACTIONS, key=len, reverse=True)
+    ))
+
+def match_actions(query_lower: str) -> Set[str]:
+    """All actions whose keywords occur in the query, found in one pass"""
+    if _keyword_automaton is not None:
+        return {action for _, action in _keyword_automaton.iter(query_lower)}
+    return {_KEYWORD_ACTIONS[m.group(1)] for m in _RE_KEYWORDS.finditer(query_lower)}
+
 async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, Any]:
     """Parse natural language query and determine appropriate action"""
+    # Conjunctive queries ("verify X, check coverage and generate a report")
+    # become one sub-action per clause
+    clauses = [c for c in _RE_CLAUSE_SPLIT.split(query) if c.strip()]
+    if len(clauses) > 1:
+        actions = []
+        for clause in clauses:
+            sub = await parse_natural_language_query(clause, context)
+            if sub["action"] != "help" and all(sub["action"] != a["action"] for a in actions):
+                actions.append(sub)
+        if len(actions) > 1:
+            return {
+                "action": "multi",
+                "params": {
+                    "actions": actions
+                }
+            }
+    
     query_lower = query.lower()
+    hits = match_actions(query_lower)
     
     # Extract file references
     c_files = context.get("c_files", [])
     rtl_files = context.get("rtl_files", [])
     
     # Equivalence checking queries
-    equiv_keywords = ["equivalent", "same", "match", "compare", "equiv", "verify", "check if", "are these"]
-    if any(word in query_lower for word in equiv_keywords):
+    if "equivalence" in hits:
         if c_files and rtl_files:
             # Extract function/module names with multiple patterns
-            func_patterns = [
-                r'function\s+["\']?(\w+)["\']?',
-                r'["\'](\w+)["\']?\s+function',
-                r'func\s+(\w+)',
-                r'(\w+)\s+in\s+\w+\.c'
-            ]
-            module_patterns = [
-                r'module\s+["\']?(\w+)["\']?',
-                r'["\'](\w+)["\']?\s+module',
-                r'mod\s+(\w+)',
-                r'(\w+)\s+in\s+\w+\.v'
-            ]
-            
             func_name = None
-            for pattern in func_patterns:
-                match = re.search(pattern, query_lower)
+            for pattern in _RE_FUNC_PATTERNS:
+                match = pattern.search(query_lower)
                 if match:
                     func_name = match.group(1)
                     break
             
             module_name = None
-            for pattern in module_patterns:
-                match = re.search(pattern, query_lower)
+            for pattern in _RE_MOD_PATTERNS:
+                match = pattern.search(query_lower)
                 if match:
                     module_name = match.group(1)
                     break
@@ -503,7 +960,7 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
             
             # Extract depth if specified
             depth = 20
-            depth_match = re.search(r'depth\s+(\d+)', query_lower)
+            depth_match = _RE_EQUIV_DEPTH.search(query_lower)
             if depth_match:
                 depth = int(depth_match.group(1))
             
@@ -520,8 +977,7 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
             }
     
     # Property mining queries
-    prop_keywords = ["properties", "property", "mine", "discover", "extract", "find", "invariant", "temporal", "relationship"]
-    elif any(word in query_lower for word in prop_keywords):
+    if "property_mining" in hits:
         # Determine mining strategy
         strategy = "all"
         if "invariant" in query_lower:
@@ -541,7 +997,7 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
         }
     
     # Coverage queries
-    elif any(word in query_lower for word in ["coverage", "covered", "test"]):
+    elif "coverage" in hits:
         coverage_type = "all"
         if "line" in query_lower:
             coverage_type = "line"
@@ -558,7 +1014,7 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
         }
     
     # Debug queries
-    elif any(word in query_lower for word in ["debug", "why failed", "counterexample", "trace"]):
+    elif "debug" in hits:
         return {
             "action": "debug",
             "params": {
@@ -567,7 +1023,7 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
         }
     
     # Report generation
-    elif any(word in query_lower for word in ["report", "summary", "results"]):
+    elif "report" in hits:
         format_type = "html"
         if "pdf" in query_lower:
             format_type = "pdf"
@@ -582,8 +1038,8 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
         }
     
     # BMC queries
-    elif any(word in query_lower for word in ["bounded", "bmc", "depth"]):
-        depth_match = re.search(r'depth\s+(\d+)|bound\s+(\d+)', query_lower)
+    elif "bmc" in hits:
+        depth_match = _RE_DEPTH.search(query_lower)
         depth = int(depth_match.group(1) or depth_match.group(2)) if depth_match else 100
         
         return {
@@ -594,8 +1050,8 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
         }
     
     # K-induction queries
-    elif any(word in query_lower for word in ["induction", "inductive", "prove"]):
-        k_match = re.search(r'k\s*=\s*(\d+)', query_lower)
+    elif "k_induction" in hits:
+        k_match = _RE_K.search(query_lower)
         k = int(k_match.group(1)) if k_match else 10
         
         return {
@@ -611,104 +1067,97 @@ async def parse_natural_language_query(query: str, context: Dict) -> Dict[str, A
         "params": {}
     }
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> List[types.TextContent]:
-    """Execute C2RTL verification tools"""
-    logger.info(f"Calling tool: {name} with arguments: {arguments}")
-    
-    if name == "c2rtl_natural_language":
-        query = arguments.get("query", "")
-        context = arguments.get("context", {})
-        
-        # Parse the query
-        parsed = await parse_natural_language_query(query, context)
-        action = parsed["action"]
-        params = parsed["params"]
-        
-        # Execute the appropriate action
-        if action == "equivalence":
-            if params.get("c_file") and params.get("rtl_file"):
-                return await call_tool("c2rtl_equivalence", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="Please provide both C and RTL files for equivalence checking."
-                )]
-        
-        elif action == "property_mining":
-            if params.get("c_file") or params.get("rtl_file"):
-                return await call_tool("c2rtl_property_mining", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="Please provide C and/or RTL files for property mining."
-                )]
-        
-        elif action == "coverage":
-            c_files = context.get("c_files", [])
-            rtl_files = context.get("rtl_files", [])
-            if c_files and rtl_files:
-                params["c_file"] = c_files[0]
-                params["rtl_file"] = rtl_files[0]
-                return await call_tool("c2rtl_coverage", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="Please provide C and RTL files for coverage analysis."
-                )]
-        
-        elif action == "debug":
-            verification_ids = context.get("verification_ids", [])
-            if verification_ids:
-                params["verification_id"] = verification_ids[-1]  # Latest verification
-                return await call_tool("c2rtl_debug", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="No verification results found to debug. Run a verification first."
-                )]
-        
-        elif action == "report":
-            verification_ids = context.get("verification_ids", list(verification_results.keys()))
-            if verification_ids:
-                params["verification_ids"] = verification_ids
-                return await call_tool("c2rtl_report", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="No verification results found for report generation."
-                )]
-        
-        elif action == "bmc":
-            c_files = context.get("c_files", [])
-            rtl_files = context.get("rtl_files", [])
-            if c_files and rtl_files:
-                params["c_file"] = c_files[0]
-                params["rtl_file"] = rtl_files[0]
-                return await call_tool("c2rtl_bmc", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="Please provide C and RTL files for bounded model checking."
-                )]
-        
-        elif action == "k_induction":
-            c_files = context.get("c_files", [])
-            rtl_files = context.get("rtl_files", [])
-            if c_files and rtl_files:
-                params["c_file"] = c_files[0]
-                params["rtl_file"] = rtl_files[0]
-                return await call_tool("c2rtl_k_induction", params)
-            else:
-                return [types.TextContent(
-                    type="text",
-                    text="Please provide C and RTL files for k-induction proof."
-                )]
-        
-        else:  # help
-            return [types.TextContent(
-                type="text",
-                text="""C2RTL Verification Natural Language Interface
+async def _handle_equivalence(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Check C/RTL equivalence for a parsed query"""
+    if params.get("c_file") and params.get("rtl_file"):
+        return await call_tool("c2rtl_equivalence", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="Please provide both C and RTL files for equivalence checking."
+        )]
+
+async def _handle_property_mining(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Mine properties for a parsed query"""
+    if params.get("c_file") or params.get("rtl_file"):
+        return await call_tool("c2rtl_property_mining", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="Please provide C and/or RTL files for property mining."
+        )]
+
+async def _handle_coverage(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Analyze coverage for the files in context"""
+    c_files = context.get("c_files", [])
+    rtl_files = context.get("rtl_files", [])
+    if c_files and rtl_files:
+        params["c_file"] = c_files[0]
+        params["rtl_file"] = rtl_files[0]
+        return await call_tool("c2rtl_coverage", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="Please provide C and RTL files for coverage analysis."
+        )]
+
+async def _handle_debug(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Debug the most recent verification in context"""
+    verification_ids = context.get("verification_ids", [])
+    if verification_ids:
+        params["verification_id"] = verification_ids[-1]  # Latest verification
+        return await call_tool("c2rtl_debug", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="No verification results found to debug. Run a verification first."
+        )]
+
+async def _handle_report(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Report on the verifications in context"""
+    verification_ids = context.get("verification_ids", list(verification_results.keys()))
+    if verification_ids:
+        params["verification_ids"] = verification_ids
+        return await call_tool("c2rtl_report", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="No verification results found for report generation."
+        )]
+
+async def _handle_bmc(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Run bounded model checking on the files in context"""
+    c_files = context.get("c_files", [])
+    rtl_files = context.get("rtl_files", [])
+    if c_files and rtl_files:
+        params["c_file"] = c_files[0]
+        params["rtl_file"] = rtl_files[0]
+        return await call_tool("c2rtl_bmc", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="Please provide C and RTL files for bounded model checking."
+        )]
+
+async def _handle_k_induction(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Run a k-induction proof on the files in context"""
+    c_files = context.get("c_files", [])
+    rtl_files = context.get("rtl_files", [])
+    if c_files and rtl_files:
+        params["c_file"] = c_files[0]
+        params["rtl_file"] = rtl_files[0]
+        return await call_tool("c2rtl_k_induction", params)
+    else:
+        return [types.TextContent(
+            type="text",
+            text="Please provide C and RTL files for k-induction proof."
+        )]
+
+async def _handle_help(params: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Explain what the natural language interface understands"""
+    return [types.TextContent(
+        type="text",
+        text="""C2RTL Verification Natural Language Interface
 
 I understand natural language queries for C-to-RTL verification. Here are examples:
 
@@ -761,7 +1210,131 @@ Example with context:
     "rtl_files": ["alu.v"]
   }
 }"""
-            )]
+    )]
+
+# Natural language action -> handler; unknown actions get the help text
+_ACTION_HANDLERS: Dict[str, Callable[[Dict[str, Any], Dict], Awaitable[List[types.TextContent]]]] = {
+    "equivalence": _handle_equivalence,
+    "property_mining": _handle_property_mining,
+    "coverage": _handle_coverage,
+    "debug": _handle_debug,
+    "report": _handle_report,
+    "bmc": _handle_bmc,
+    "k_induction": _handle_k_induction
+}
+
+async def execute_nl_action(parsed: Dict[str, Any], context: Dict) -> List[types.TextContent]:
+    """Run the tool call(s) selected by parse_natural_language_query"""
+    action = parsed["action"]
+    params = parsed["params"]
+    
+    if action == "multi":
+        # Reports and debugging read the other actions' results, so they go last;
+        # everything else is independent and runs concurrently
+        subs = params["actions"]
+        stages = [
+            [sub for sub in subs if sub["action"] not in ("report", "debug")],
+            [sub for sub in subs if sub["action"] in ("report", "debug")]
+        ]
+        contents = []
+        for stage in stages:
+            results = await asyncio.gather(
+                *(execute_nl_action(sub, context) for sub in stage),
+                return_exceptions=True
+            )
+            for sub, result in zip(stage, results):
+                if isinstance(result, Exception):
+                    logger.error(f"{sub['action']} failed: {result}")
+                    contents.append(types.TextContent(
+                        type="text",
+                        text=f"{sub['action']} failed: {result}"
+                    ))
+                else:
+                    contents.extend(result)
+        return contents
+    
+    handler = _ACTION_HANDLERS.get(action, _handle_help)
+    return await handler(params, context)
+
+class NLBatcher:
+    """Coalesces bursts of identical natural language requests into one execution"""
+    
+    def __init__(self, max_batch_size: int = 16, max_wait_ms: int = 50):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self.runner: Optional[asyncio.Task] = None
+        self.running: Set[asyncio.Task] = set()
+    
+    async def submit(self, query: str, context: Dict) -> List[types.TextContent]:
+        """Queue a query and wait for the (possibly shared) result"""
+        if self.runner is None or self.runner.done():
+            self.queue = asyncio.Queue()
+            self.runner = asyncio.create_task(self.run())
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((query, context, future))
+        return await future
+    
+    async def run(self):
+        """Drain the queue in batches and start one execution per distinct request"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Queries that parse to the same action, parameters and context share
+            # one execution, however differently they were phrased
+            groups: Dict[str, Tuple[Dict[str, Any], Dict, List[asyncio.Future]]] = {}
+            for query, context, future in batch:
+                try:
+                    parsed = await parse_natural_language_query(query, context)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+                key = json.dumps([parsed, context], sort_keys=True, default=str)
+                groups.setdefault(key, (parsed, context, []))[2].append(future)
+            
+            for parsed, context, futures in groups.values():
+                task = asyncio.create_task(self.execute(parsed, context, futures))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+    
+    async def execute(self, parsed: Dict[str, Any], context: Dict, futures: List[asyncio.Future]):
+        try:
+            contents = await execute_nl_action(parsed, context)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        if len(futures) > 1:
+            logger.info(f"Coalesced {len(futures)} '{parsed['action']}' requests")
+        for future in futures:
+            if not future.done():
+                future.set_result(list(contents))
+
+nl_batcher = NLBatcher()
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> List[types.TextContent]:
+    """Execute C2RTL verification tools"""
+    logger.info(f"Calling tool: {name} with arguments: {arguments}")
+    
+    if name == "c2rtl_natural_language":
+        query = arguments.get("query", "")
+        context = arguments.get("context", {})
+        
+        # Parsed and executed by the batcher, which folds duplicate bursts together
+        return await nl_batcher.submit(query, context)
     
     elif name == "c2rtl_equivalence":
         # Enhanced equivalence checking
@@ -772,8 +1345,13 @@ Example with context:
         method = arguments.get("method", "verilator-cbmc")
         depth = arguments.get("depth", 20)
         
+        # Fail in milliseconds rather than after a Verilator or yosys start
+        problem = _precheck(c_file, c_function, rtl_file, rtl_module)
+        if problem:
+            return [types.TextContent(type="text", text=problem)]
+        
         # Create verification ID
-        verification_id = f"verify_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        verification_id = f"verify_{_SESSION_ID}_{next(_verify_counter):04d}"
         
         # Initialize result
         result = VerificationResult(
@@ -786,30 +1364,32 @@ Example with context:
             result={}
         )
         
-        verification_results[verification_id] = result
+        store_verification_result(result)
         
         # Run verification based on method
         if method == "verilator-cbmc":
-            verification_output = await verify_with_verilator_cbmc(
+            status, verification_output = await verify_with_verilator_cbmc(
                 c_file, rtl_file, c_function, rtl_module, depth
             )
         elif method == "symbiyosys":
-            verification_output = await verify_with_symbiyosys(
+            status, verification_output = await verify_with_symbiyosys(
+                c_file, rtl_file, c_function, rtl_module, depth
+            )
+        elif method == "smt-pool":
+            status, verification_output = await verify_with_pooled_solver(
                 c_file, rtl_file, c_function, rtl_module, depth
             )
         else:
+            status = VerificationStatus.ERROR
             verification_output = [types.TextContent(
                 type="text",
                 text=f"Method {method} not implemented"
             )]
         
-        # Update result status
-        if "EQUIVALENT" in str(verification_output):
-            result.status = VerificationStatus.PASSED
-        else:
-            result.status = VerificationStatus.FAILED
+        # Update result status from the verifier's verdict
+        result.status = status
         
-        verification_results[verification_id] = result
+        store_verification_result(result)
         
         # Add verification ID to output
         output_text = verification_output[0].text if verification_output else ""
@@ -842,7 +1422,18 @@ Example with context:
         rtl_file = arguments.get("rtl_file")
         strategy = arguments.get("mining_strategy", "all")
         
-        return await mine_properties(c_file, rtl_file, strategy)
+        contents = await mine_properties(c_file, rtl_file, strategy)
+        if arguments.get("verify") and rtl_file and arguments.get("rtl_module"):
+            # All mined properties share one design setup and solver session
+            properties = [
+                prop for kind, props in MINED_SVA.items()
+                if strategy in (kind, "all") for prop in props
+            ]
+            _, verified = await verify_with_symbiyosys_multi(
+                rtl_file, arguments["rtl_module"], properties, arguments.get("depth", 20)
+            )
+            contents.extend(verified)
+        return contents
     
     elif name == "c2rtl_coverage":
         c_file = arguments.get("c_file")
@@ -855,13 +1446,13 @@ Example with context:
         verification_id = arguments.get("verification_id")
         analysis_type = arguments.get("analysis_type", "trace")
         
-        if verification_id not in verification_results:
+        result = get_verification_result(verification_id)
+        if result is None:
             return [types.TextContent(
                 type="text",
                 text=f"Verification ID {verification_id} not found"
             )]
         
-        result = verification_results[verification_id]
         return await debug_verification(result, analysis_type)
     
     elif name == "c2rtl_report":
@@ -876,70 +1467,121 @@ Example with context:
             text=f"Unknown tool: {name}"
         )]
 
+# Verilator builds, reused while the RTL, its includes and the wrapper are unchanged;
+# kept in the user's own cache since existing builds are trusted
+BUILD_DIR = CACHE_DIR / "verilator"
+_RE_VERILOG_INCLUDE = re.compile(rb'`include\s+"([^"]+)"')
+
+def rtl_dependencies(rtl_file: str) -> List[str]:
+    """rtl_file followed by every file it `includes, directly or indirectly"""
+    top_dir = os.path.dirname(os.path.abspath(rtl_file))
+    deps = [os.path.abspath(rtl_file)]
+    for path in deps:
+        with open(path, 'rb') as f:
+            text = f.read()
+        for name in _RE_VERILOG_INCLUDE.findall(text):
+            name = name.decode(errors="replace")
+            # Relative to the including file first, then to the top-level file
+            for base in (os.path.dirname(path), top_dir):
+                candidate = os.path.normpath(os.path.join(base, name))
+                if os.path.isfile(candidate):
+                    if candidate not in deps:
+                        deps.append(candidate)
+                    break
+    return deps
+
 async def verify_with_verilator_cbmc(
     c_file: str, rtl_file: str, c_function: str, rtl_module: str, depth: int
-) -> List[types.TextContent]:
+) -> Tuple[VerificationStatus, List[types.TextContent]]:
     """Enhanced Verilator + CBMC verification with better analysis"""
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Step 1: Analyze C function signature
-        c_analysis = analyze_c_function(c_file, c_function)
-        
-        # Step 2: Analyze RTL module interface
-        rtl_analysis = analyze_rtl_module(rtl_file, rtl_module)
-        
-        # Step 3: Generate verification wrapper
-        wrapper_code = generate_verification_wrapper(
-            c_analysis, rtl_analysis, c_function, rtl_module
-        )
-        
-        wrapper_path = os.path.join(tmpdir, "verify_wrapper.cpp")
-        with open(wrapper_path, 'w') as f:
-            f.write(wrapper_code)
-        
-        # Step 4: Verilate RTL
-        verilate_cmd = [
-            "verilator",
-            "--cc",
-            rtl_file,
-            "--exe",
-            wrapper_path,
-            "--build",
-            "-Wall",
-            "--top-module", rtl_module,
-            "--Mdir", tmpdir,
-            "-CFLAGS", f"-I{os.path.dirname(c_file)}"
-        ]
-        
-        result = run_command(verilate_cmd, cwd=tmpdir)
-        if not result["success"]:
-            return [types.TextContent(
-                type="text",
-                text=f"Verilator failed:\n{result.get('stderr', '')}"
-            )]
-        
-        # Step 5: Run CBMC
-        cbmc_cmd = [
-            "cbmc",
-            wrapper_path,
-            f"-I{tmpdir}",
-            f"-I{os.path.dirname(c_file)}",
-            "--unwind", str(depth),
-            "--bounds-check",
-            "--pointer-check",
-            "--trace",
-            "--json-ui"
-        ]
-        
-        result = run_command(cbmc_cmd, cwd=tmpdir)
-        
-        # Parse CBMC output
-        verification_status = "EQUIVALENT" if result["success"] else "NOT EQUIVALENT"
-        
-        return [types.TextContent(
-            type="text",
-            text=f"""Verilator+CBMC Verification Results:
+    key, status, cached = cache_get_verdict(
+        [c_file, rtl_file], ["c2rtl_equivalence", "verilator-cbmc", c_function, rtl_module, depth]
+    )
+    if cached is not None:
+        return status, cached
+    
+    # Steps 1-2: Analyze the C signature and RTL interface side by side
+    c_analysis, rtl_analysis = await asyncio.gather(
+        asyncio.to_thread(analyze_c_function, c_file, c_function),
+        asyncio.to_thread(analyze_rtl_module, rtl_file, rtl_module)
+    )
+    
+    # Step 3: Generate verification wrapper
+    wrapper_code = generate_verification_wrapper(
+        c_analysis, rtl_analysis, c_function, rtl_module
+    )
+    
+    # Step 4: Verilate RTL once per (RTL and its includes, module, wrapper); depth
+    # only affects CBMC
+    c_dir = os.path.dirname(c_file)
+    h = hashlib.sha256()
+    try:
+        for path in rtl_dependencies(rtl_file):
+            with open(path, 'rb') as f:
+                h.update(path.encode() + b"\0" + f.read() + b"\0")
+    except OSError as e:
+        return VerificationStatus.ERROR, [types.TextContent(type="text", text=f"Cannot read RTL file: {e}")]
+    h.update(f"{rtl_module}\0{c_dir}\0{wrapper_code}".encode())
+    build_key = h.hexdigest()[:16]
+    BUILD_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    build_dir = BUILD_DIR / build_key
+    wrapper_path = str(build_dir / "verify_wrapper.cpp")
+    
+    async with _build_locks.setdefault(build_key, asyncio.Lock()):
+        if not any((build_dir / f"V{rtl_module}__ALL.{ext}").exists() for ext in ("o", "a")):
+            build_dir.mkdir(exist_ok=True)
+            with open(wrapper_path, 'w') as f:
+                f.write(wrapper_code)
             
+            verilate_cmd = [
+                "verilator",
+                "--cc",
+                rtl_file,
+                "--exe",
+                wrapper_path,
+                "--build",
+                "-Wall",
+                "--top-module", rtl_module,
+                "--Mdir", str(build_dir),
+                "-CFLAGS", f"-I{c_dir}"
+            ]
+            
+            result = await run_command(verilate_cmd, cwd=str(build_dir))
+            if not result["success"]:
+                return VerificationStatus.ERROR, [types.TextContent(
+                    type="text",
+                    text=f"Verilator failed:\n{result.get('stderr', '')}"
+                )]
+        else:
+            logger.info(f"Reusing Verilator build in {build_dir}")
+    
+    # Step 5: Run CBMC
+    cbmc_cmd = [
+        "cbmc",
+        wrapper_path,
+        f"-I{build_dir}",
+        f"-I{c_dir}",
+        "--unwind", str(depth),
+        "--bounds-check",
+        "--pointer-check",
+        "--trace",
+        "--json-ui"
+    ]
+    
+    result = await run_command(cbmc_cmd, cwd=str(build_dir))
+    
+    # Parse CBMC output
+    status = parse_cbmc_status(result.get("stdout", ""))
+    verification_status = {
+        VerificationStatus.PASSED: "EQUIVALENT",
+        VerificationStatus.FAILED: "NOT EQUIVALENT"
+    }.get(status, "ERROR")
+    
+    contents = [types.TextContent(
+        type="text",
+        text=f"""Verilator+CBMC Verification Results:
+        
 C Function: {c_function} in {c_file}
 RTL Module: {rtl_module} in {rtl_file}
 Verification Depth: {depth}
@@ -948,13 +1590,25 @@ Result: {verification_status}
 
 {result.get('stdout', '')}
 {result.get('stderr', '')}"""
-        )]
+    )]
+    
+    # Only cache actual verdicts, not tool errors
+    if status != VerificationStatus.ERROR:
+        cache_put(key, contents, status)
+    
+    return status, [types.TextContent(type="text", text=contents[0].text + log_note(result))]
 
 async def verify_with_symbiyosys(
     c_file: str, rtl_file: str, c_function: str, rtl_module: str, depth: int
-) -> List[types.TextContent]:
+) -> Tuple[VerificationStatus, List[types.TextContent]]:
     """Verification using SymbiYosys formal verification"""
     
+    key, status, cached = cache_get_verdict(
+        [c_file, rtl_file], ["c2rtl_equivalence", "symbiyosys", c_function, rtl_module, depth]
+    )
+    if cached is not None:
+        return status, cached
+    
     with tempfile.TemporaryDirectory() as tmpdir:
         # Generate SystemVerilog wrapper with assertions
         sv_wrapper = generate_sv_wrapper_with_assertions(
@@ -989,24 +1643,349 @@ prep -top {rtl_module}_verify
             f.write(sby_config)
         
         # Run SymbiYosys
-        result = run_command(["sby", "-f", sby_path], cwd=tmpdir)
+        result = await run_command(["sby", "-f", sby_path], cwd=tmpdir)
         
-        return [types.TextContent(
+        # sby exits 0 on PASS and 2 on FAIL; anything else is a tool error
+        status = {
+            0: VerificationStatus.PASSED,
+            2: VerificationStatus.FAILED
+        }.get(result.get("returncode"), VerificationStatus.ERROR)
+        
+        contents = [types.TextContent(
             type="text",
             text=f"""SymbiYosys Verification Results:
 
-Status: {'PASSED' if result['success'] else 'FAILED'}
+Status: {status.value.upper()}
 
 {result.get('stdout', '')}"""
         )]
+        
+        if status != VerificationStatus.ERROR:
+            cache_put(key, contents, status)
+        
+        return status, [types.TextContent(type="text", text=contents[0].text + log_note(result))]
+
+async def verify_with_pooled_solver(
+    c_file: str, rtl_file: str, c_function: str, rtl_module: str, depth: int
+) -> Tuple[VerificationStatus, List[types.TextContent]]:
+    """Bounded check of the SymbiYosys wrapper on a warm pooled solver, bypassing sby"""
+    
+    key, status, cached = cache_get_verdict(
+        [c_file, rtl_file], ["c2rtl_equivalence", "smt-pool", c_function, rtl_module, depth]
+    )
+    if cached is not None:
+        return status, cached
+    
+    top = f"{rtl_module}_verify"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wrapper_path = os.path.join(tmpdir, f"{top}.sv")
+        with open(wrapper_path, 'w') as f:
+            f.write(generate_sv_wrapper_with_assertions(c_file, rtl_file, c_function, rtl_module))
+        
+        # Yosys only lowers the design to SMT-LIB2; the unrolling happens below. The
+        # state is encoded as a plain bit-vector (-stbv) rather than an uninterpreted
+        # sort, which Boolector and other QF_BV-only solvers don't accept
+        smt2_path = os.path.join(tmpdir, f"{top}.smt2")
+        result = await run_command([
+            "yosys", "-q", "-p",
+            f"read -formal {wrapper_path}; read -formal {rtl_file}; prep -top {top}; "
+            f"flatten; async2sync; dffunmap; setundef -anyseq; write_smt2 -wires -stbv {smt2_path}"
+        ], cwd=tmpdir)
+        if not result.get("success"):
+            return VerificationStatus.ERROR, [types.TextContent(
+                type="text",
+                text=f"Yosys failed to lower {top} to SMT-LIB2:\n{result.get('stderr', result.get('error', ''))}"
+            )]
+        with open(smt2_path) as f:
+            design = f.read()
+    
+    # Same unrolling as yosys-smtbmc: state s0 is initial, each later state is a
+    # transition from the previous one, and asserts proven at a step are kept
+    failed_step = None
+    try:
+        async with _solver_pool.acquire() as solver:
+            await solver.send(design)
+            for step in range(depth):
+                state = f"s{step}"
+                text = f"(declare-fun {state} () |{top}_s|)\n(assert (|{top}_h| {state}))\n"
+                if step == 0:
+                    text += f"(assert (|{top}_i| {state}))\n(assert (|{top}_is| {state}))\n"
+                else:
+                    text += f"(assert (|{top}_t| s{step - 1} {state}))\n(assert (not (|{top}_is| {state})))\n"
+                text += f"(assert (|{top}_u| {state}))\n"
+                await solver.send(text)
+                
+                await solver.send(f"(push 1)\n(assert (not (|{top}_a| {state})))\n")
+                answer = await solver.check_sat()
+                await solver.send("(pop 1)\n")
+                if answer == "sat":
+                    failed_step = step
+                    break
+                if answer != "unsat":
+                    raise RuntimeError(f"solver answered {answer} at step {step}")
+                await solver.send(f"(assert (|{top}_a| {state}))\n")
+    except Exception as e:
+        return VerificationStatus.ERROR, [types.TextContent(
+            type="text",
+            text=f"Pooled solver check failed: {str(e)}"
+        )]
+    
+    if failed_step is None:
+        status = VerificationStatus.PASSED
+        detail = f"All assertions hold for {depth} steps"
+    else:
+        status = VerificationStatus.FAILED
+        detail = f"Assertion violated at step {failed_step}"
+    
+    contents = [types.TextContent(
+        type="text",
+        text=f"""Pooled Solver Verification Results:
+
+Status: {status.value.upper()}
+Solver: {' '.join(SMT_SOLVER_CMD)}
+Depth: {depth}
+
+{detail}"""
+    )]
+    cache_put(key, contents, status)
+    
+    return status, contents
+
+# Assertion label as reported by smtbmc, e.g. "Assert failed in top_props: a2"
+_RE_SBY_ASSERT_FAILED = re.compile(r"Assert failed in [^:]+: \S*?\b(a\d+)\b")
+
+# Verilog comments, blanked out before the module interface is scanned
+_RE_VERILOG_COMMENT = re.compile(r'/\*.*?\*/|//[^\n]*', re.S)
+_RE_PORT_DECL = re.compile(r'\b(input|output|inout)\b([^;]*);')
+_RE_RANGE = re.compile(r'\[[^\]]*\]')
+# Identifiers in an SVA expression; system functions such as $past are not signals
+_RE_SVA_IDENT = re.compile(r'(?<![$\w])[A-Za-z_]\w*')
+
+def module_ports(rtl_file: str, rtl_module: str) -> Optional[List[Tuple[str, str, str]]]:
+    """(direction, range, name) of each port of rtl_module, or None if it can't be read"""
+    with open(rtl_file) as f:
+        text = _RE_VERILOG_COMMENT.sub(" ", f.read())
+    m = re.search(rf'\bmodule\s+{re.escape(rtl_module)}\b', text)
+    if m is None:
+        return None
+    pos = m.end()
+    # Skip a #( ... ) parameter list, then take the ( ... ) port list
+    header = None
+    for _ in range(2):
+        match = re.compile(r'\s*(#?)\s*\(').match(text, pos)
+        if match is None:
+            break
+        depth, end = 0, match.end() - 1
+        for end in range(match.end() - 1, len(text)):
+            depth += {"(": 1, ")": -1}.get(text[end], 0)
+            if depth == 0:
+                break
+        if not match.group(1):
+            header = text[match.end():end]
+        pos = end + 1
+        if header is not None:
+            break
+    body_end = text.find("endmodule", pos)
+    body = text[pos:body_end if body_end >= 0 else len(text)]
+    
+    ports = []
+    if header is not None and re.search(r'\b(input|output|inout)\b', header):
+        # ANSI style: a direction and range carry over to the names that follow
+        direction, width = None, ""
+        for item in header.split(","):
+            decl = re.match(r'\s*(input|output|inout)\b(.*)', item, re.S)
+            if decl:
+                direction, rest = decl.groups()
+                width = (_RE_RANGE.search(rest) or [""])[0]
+            names = _RE_SVA_IDENT.findall(_RE_RANGE.sub(" ", item))
+            if direction is None or not names:
+                return None
+            ports.append((direction, width, names[-1]))
+    else:
+        # Non-ANSI style: directions are declared in the module body
+        for direction, rest in _RE_PORT_DECL.findall(body):
+            width = (_RE_RANGE.search(rest) or [""])[0]
+            for item in _RE_RANGE.sub(" ", rest).split(","):
+                names = _RE_SVA_IDENT.findall(item)
+                if names:
+                    ports.append((direction, width, names[-1]))
+    
+    # Widths given by module parameters can't be restated in the wrapper
+    if any(_RE_SVA_IDENT.search(width) for _, width, _ in ports):
+        return None
+    return ports
+
+async def verify_with_symbiyosys_multi(
+    rtl_file: str, rtl_module: str, properties: List[str], depth: int
+) -> Tuple[VerificationStatus, List[types.TextContent]]:
+    """Prove several properties in a single SymbiYosys run and report each one"""
+    if not properties:
+        return VerificationStatus.ERROR, [types.TextContent(type="text", text="No properties to verify")]
+    
+    try:
+        ports = module_ports(rtl_file, rtl_module)
+    except OSError as e:
+        ports = None
+        logger.warning(f"Cannot read {rtl_file}: {e}")
+    if ports is None:
+        return VerificationStatus.ERROR, [types.TextContent(
+            type="text",
+            text=f"Could not determine the ports of {rtl_module} in {rtl_file}"
+        )]
+    
+    # The wrapper drives the DUT's inputs freely and observes its outputs, so a
+    # property can only be checked if every signal it names is a port
+    port_names = {name for _, _, name in ports}
+    signals = port_names | {"clk", "rst"}
+    checked = {
+        i: prop for i, prop in enumerate(properties, 1)
+        if set(_RE_SVA_IDENT.findall(prop)) <= signals
+    }
+    if not checked:
+        return VerificationStatus.ERROR, [types.TextContent(
+            type="text",
+            text=f"None of the properties refer only to ports of {rtl_module}; nothing to verify"
+        )]
+    
+    declarations = [f"    input logic {name}" for name in ("clk", "rst") if name not in port_names]
+    declarations += [
+        f"    input logic {width + ' ' if width else ''}{name}"
+        for direction, width, name in ports if direction == "input"
+    ]
+    port_list = ",\n".join(declarations)
+    nets = "\n".join(
+        f"    logic {width + ' ' if width else ''}{name};"
+        for direction, width, name in ports if direction != "input"
+    )
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # One wrapper carries every checkable property as a labelled assertion
+        assertions = "\n".join(
+            f"    a{i}: assert property (@(posedge clk) disable iff (rst) {prop});"
+            for i, prop in checked.items()
+        )
+        wrapper_path = os.path.join(tmpdir, f"{rtl_module}_props.sv")
+        with open(wrapper_path, 'w') as f:
+            f.write(f"""module {rtl_module}_props (
+{port_list}
+);
+
+{nets}
+
+    {rtl_module} dut (.*);
+
+{assertions}
+
+endmodule""")
+        
+        # --keep-going lets smtbmc report every failing assertion, not just the first
+        sby_path = os.path.join(tmpdir, "props.sby")
+        with open(sby_path, 'w') as f:
+            f.write(f"""[options]
+mode prove
+depth {depth}
+
+[engines]
+smtbmc --keep-going boolector
+
+[script]
+read -formal {os.path.basename(wrapper_path)}
+read -formal {os.path.basename(rtl_file)}
+prep -top {rtl_module}_props
+
+[files]
+{wrapper_path}
+{rtl_file}
+""")
+        
+        result = await run_command(["sby", "-f", sby_path], cwd=tmpdir)
+    
+    status = {
+        0: VerificationStatus.PASSED,
+        2: VerificationStatus.FAILED
+    }.get(result.get("returncode"), VerificationStatus.ERROR)
+    
+    failed = set(_RE_SBY_ASSERT_FAILED.findall(result.get("stdout", "")))
+    lines = []
+    for i, prop in enumerate(properties, 1):
+        if i not in checked:
+            verdict = "SKIPPED (names signals that are not ports)"
+        elif status == VerificationStatus.ERROR:
+            verdict = "UNKNOWN"
+        else:
+            verdict = "FAIL" if f"a{i}" in failed else "PASS"
+        lines.append(f"a{i}: {verdict}  {prop}")
+    summary = "\n".join(lines)
+    
+    return status, [types.TextContent(
+        type="text",
+        text=f"""SymbiYosys Multi-Property Results:
+
+Module: {rtl_module} in {rtl_file}
+Depth: {depth}
+Overall: {status.value.upper()}
+
+{summary}
+
+{result.get('stdout', '')}{log_note(result)}"""
+    )]
+
+# BMC verdicts per (C, RTL, property file) content hash: the deepest bound
+# known to be safe and the shallowest bound known to fail
+_bmc_cache: Dict[Tuple[str, str, str], Dict[str, Optional[int]]] = {}
+_bmc_lock = asyncio.Lock()
 
 async def run_bounded_model_checking(
     c_file: str, rtl_file: str, bound: int, property_file: Optional[str]
 ) -> List[types.TextContent]:
     """Run bounded model checking"""
     
-    # Implementation would use CBMC or similar BMC tool
-    return [types.TextContent(
+    key, cached = cache_get([c_file, rtl_file, property_file], ["c2rtl_bmc", bound])
+    if cached is not None:
+        return cached
+    
+    try:
+        bmc_key = tuple(cache_key([path], []) for path in (c_file, rtl_file, property_file))
+    except OSError as e:
+        return [types.TextContent(type="text", text=f"Cannot read BMC inputs: {e}")]
+    
+    # Safe at bound D means safe at every bound below D, and a counterexample
+    # at bound D is still one at every bound above it
+    async with _bmc_lock:
+        known = dict(_bmc_cache.get(bmc_key, {}))
+    
+    result = {}
+    if known.get("safe_up_to") is not None and bound <= known["safe_up_to"]:
+        status = VerificationStatus.PASSED
+        source = f"implied by a safe run at bound {known['safe_up_to']}"
+    elif known.get("fails_at") is not None and bound >= known["fails_at"]:
+        status = VerificationStatus.FAILED
+        source = f"implied by a counterexample at bound {known['fails_at']}"
+    else:
+        cbmc_cmd = [
+            "cbmc",
+            c_file,
+            "--unwind", str(bound),
+            "--bounds-check",
+            "--pointer-check",
+            "--json-ui"
+        ]
+        if property_file:
+            # Property harnesses are extra C sources with assertions
+            cbmc_cmd.insert(2, property_file)
+        
+        result = await run_command(cbmc_cmd)
+        status = parse_cbmc_status(result.get("stdout", ""))
+        source = "CBMC"
+        
+        async with _bmc_lock:
+            entry = _bmc_cache.setdefault(bmc_key, {"safe_up_to": None, "fails_at": None})
+            if status == VerificationStatus.PASSED:
+                entry["safe_up_to"] = max(entry["safe_up_to"] or 0, bound)
+            elif status == VerificationStatus.FAILED:
+                entry["fails_at"] = min(entry["fails_at"] or bound, bound)
+    
+    contents = [types.TextContent(
         type="text",
         text=f"""Bounded Model Checking Results:
         
@@ -1014,12 +1993,15 @@ C File: {c_file}
 RTL File: {rtl_file}
 Bound: {bound}
 
-BMC implementation would check properties up to bound {bound}.
-This would integrate with tools like:
-- CBMC for C code
-- ABC or SymbiYosys for RTL
-- Custom property checkers"""
+Result: {status.value.upper()} ({source})
+
+{result.get('stdout', '')}
+{result.get('error', '')}"""
     )]
+    
+    if status != VerificationStatus.ERROR:
+        cache_put(key, contents, status)
+    return contents
 
 async def run_k_induction(
     c_file: str, rtl_file: str, k: int, base_case_depth: int
@@ -1041,11 +2023,30 @@ K-induction would:
 3. Combine to prove unbounded correctness"""
     )]
 
+# SVA forms of the properties mine_properties reports, by strategy
+MINED_SVA = {
+    "invariants": [
+        "counter >= 0 && counter < MAX_COUNT",
+        "state != ERROR || error_flag"
+    ],
+    "relationships": [
+        "(output > input) |-> overflow_flag",
+        "enable |-> (output != $past(output))"
+    ],
+    "temporal": [
+        "req |-> ##[1:10] ack"
+    ]
+}
+
 async def mine_properties(
     c_file: str, rtl_file: str, strategy: str
 ) -> List[types.TextContent]:
     """Mine properties from C and RTL code"""
     
+    key, cached = cache_get([c_file, rtl_file], ["c2rtl_property_mining", strategy])
+    if cached is not None:
+        return cached
+    
     properties = []
     
     if strategy in ["invariants", "all"]:
@@ -1066,7 +2067,7 @@ async def mine_properties(
         properties.append("property req_ack; req |-> ##[1:10] ack; endproperty")
         properties.append("property no_deadlock; busy |-> ##[1:$] !busy; endproperty")
     
-    return [types.TextContent(
+    contents = [types.TextContent(
         type="text",
         text=f"""Property Mining Results:
 
@@ -1082,12 +2083,19 @@ These properties can be used for verification with:
 - Simulation-based verification
 - Runtime assertion checking"""
     )]
+    
+    cache_put(key, contents)
+    return contents
 
 async def analyze_coverage(
     c_file: str, rtl_file: str, coverage_type: str
 ) -> List[types.TextContent]:
     """Analyze verification coverage"""
     
+    key, cached = cache_get([c_file, rtl_file], ["c2rtl_coverage", coverage_type])
+    if cached is not None:
+        return cached
+    
     coverage_report = f"""Coverage Analysis Report:
 
 C File: {c_file}
@@ -1130,7 +2138,9 @@ Coverage Type: {coverage_type}
 - Transition Coverage: 87.5% (21/24 transitions)
 """
     
-    return [types.TextContent(type="text", text=coverage_report)]
+    contents = [types.TextContent(type="text", text=coverage_report)]
+    cache_put(key, contents)
+    return contents
 
 async def debug_verification(
     result: VerificationResult, analysis_type: str
@@ -1224,13 +2234,13 @@ async def generate_report(
 """
         
         for vid in verification_ids:
-            if vid in verification_results:
-                r = verification_results[vid]
+            r = get_verification_result(vid)
+            if r is not None:
                 status_class = "passed" if r.status == VerificationStatus.PASSED else "failed"
                 report += f"""        <tr>
             <td>{r.id}</td>
-            <td>{os.path.basename(r.c_file)}</td>
-            <td>{os.path.basename(r.rtl_file)}</td>
+            <td>{r.c_basename}</td>
+            <td>{r.rtl_basename}</td>
             <td>{r.method}</td>
             <td class="{status_class}">{r.status.value}</td>
         </tr>
@@ -1257,9 +2267,9 @@ async def generate_report(
         report += "|---|---|---|---|---|\n"
         
         for vid in verification_ids:
-            if vid in verification_results:
-                r = verification_results[vid]
-                report += f"| {r.id} | {os.path.basename(r.c_file)} | {os.path.basename(r.rtl_file)} | {r.method} | {r.status.value} |\n"
+            r = get_verification_result(vid)
+            if r is not None:
+                report += f"| {r.id} | {r.c_basename} | {r.rtl_basename} | {r.method} | {r.status.value} |\n"
         
         return [types.TextContent(type="text", text=report)]
     
@@ -1269,6 +2279,24 @@ async def generate_report(
             text=f"Report format {format_type} not implemented"
         )]
 
+# Analysis results keyed by (function, path, mtime, size, other args)
+_analysis_cache: Dict[Tuple, Any] = {}
+
+def cached_analyze(fn):
+    """Memoize a function whose first argument is a source file, until that file changes"""
+    @functools.wraps(fn)
+    def wrapper(path: str, *args):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return fn(path, *args)
+        key = (fn.__name__, path, st.st_mtime_ns, st.st_size, args)
+        if key not in _analysis_cache:
+            _analysis_cache[key] = fn(path, *args)
+        return _analysis_cache[key]
+    return wrapper
+
+@cached_analyze
 def analyze_c_function(c_file: str, function_name: str) -> Dict[str, Any]:
     """Analyze C function signature and behavior"""
     # Simplified analysis - would use proper C parser in production
@@ -1279,6 +2307,7 @@ def analyze_c_function(c_file: str, function_name: str) -> Dict[str, Any]:
         "has_state": False
     }
 
+@cached_analyze
 def analyze_rtl_module(rtl_file: str, module_name: str) -> Dict[str, Any]:
     """Analyze RTL module interface"""
     # Simplified analysis - would use proper Verilog parser in production
@@ -1322,6 +2351,7 @@ int main() {{
     return 0;
 }}"""
 
+@cached_analyze
 def generate_sv_wrapper_with_assertions(
     c_file: str, rtl_file: str, c_function: str, rtl_module: str
 ) -> str:
@@ -1364,6 +2394,7 @@ endmodule"""
 async def main():
     """Run the enhanced C2RTL verification MCP server"""
     logger.info("Starting enhanced C2RTL verification MCP server")
+    prune_logs()
     
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
@@ -13,8 +13,8 @@ import os
 import sys
 import re
 import datetime
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+import functools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -83,6 +83,16 @@ def run_command(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300) -
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+# Cap on verifier processes (Verilator, CBMC, sby, replays) running at once
+# across all requests
+MAX_JOBS = int(os.environ.get("C2RTL_MAX_JOBS", os.cpu_count() or 4))
+_JOB_SEM = asyncio.Semaphore(MAX_JOBS)
+
+async def run_job(cmd: List[str], cwd: Optional[str] = None, timeout: int = 300) -> Dict[str, Any]:
+    """run_command in a worker thread, admitted through the global job cap"""
+    async with _JOB_SEM:
+        return await asyncio.to_thread(run_command, cmd, cwd, timeout)
+
 @server.list_resources()
 async def list_resources() -> List[types.Resource]:
     """List available verification results as resources"""
@@ -397,6 +407,14 @@ async def list_tools() -> List[types.Tool]:
                         "type": "string",
                         "enum": ["trace", "minimize", "visualize", "explain"],
                         "default": "trace"
+                    },
+                    "inputs": {
+                        "type": "array",
+                        "description": "Failing (a, b) input sequence to minimize; defaults to the recorded counterexample",
+                        "items": {
+                            "type": "array",
+                            "items": {"type": "integer"}
+                        }
                     }
                 },
                 "required": ["verification_id"]
@@ -692,7 +710,7 @@ Please provide C and RTL files in the context for most operations."""
             rtl_file=rtl_file,
             method=method,
             status=VerificationStatus.RUNNING,
-            result={}
+            result={"c_function": c_function, "rtl_module": rtl_module}
         )
         
         verification_results[verification_id] = result
@@ -771,7 +789,7 @@ Please provide C and RTL files in the context for most operations."""
             )]
         
         result = verification_results[verification_id]
-        return await debug_verification(result, analysis_type)
+        return await debug_verification(result, analysis_type, arguments.get("inputs"))
     
     elif name == "c2rtl_report":
         verification_ids = arguments.get("verification_ids", list(verification_results.keys()))
@@ -820,7 +838,7 @@ async def verify_with_verilator_cbmc(
             "-CFLAGS", f"-I{os.path.dirname(c_file)}"
         ]
         
-        result = run_command(verilate_cmd, cwd=tmpdir)
+        result = await run_job(verilate_cmd, cwd=tmpdir)
         if not result["success"]:
             return [types.TextContent(
                 type="text",
@@ -840,7 +858,7 @@ async def verify_with_verilator_cbmc(
             "--json-ui"
         ]
         
-        result = run_command(cbmc_cmd, cwd=tmpdir)
+        result = await run_job(cbmc_cmd, cwd=tmpdir)
         
         # Parse CBMC output
         verification_status = "EQUIVALENT" if result["success"] else "NOT EQUIVALENT"
@@ -898,7 +916,7 @@ prep -top {rtl_module}_verify
             f.write(sby_config)
         
         # Run SymbiYosys
-        result = run_command(["sby", "-f", sby_path], cwd=tmpdir)
+        result = await run_job(["sby", "-f", sby_path], cwd=tmpdir)
         
         return [types.TextContent(
             type="text",
@@ -950,31 +968,33 @@ K-induction would:
 3. Combine to prove unbounded correctness"""
     )]
 
+# Mined property blocks per strategy; "all" is every block in order
+_INVARIANTS_BLOCK = """// Invariants
+assert(counter >= 0 && counter < MAX_COUNT);
+assert(state != ERROR || error_flag);"""
+
+_RELATIONSHIPS_BLOCK = """
+// Input/Output Relationships
+assert(output > input -> overflow_flag);
+assert(enable -> (output != prev_output));"""
+
+_TEMPORAL_BLOCK = """
+// Temporal Properties
+property req_ack; req |-> ##[1:10] ack; endproperty
+property no_deadlock; busy |-> ##[1:$] !busy; endproperty"""
+
+_MINED_PROPERTIES = {
+    "invariants": _INVARIANTS_BLOCK,
+    "relationships": _RELATIONSHIPS_BLOCK,
+    "temporal": _TEMPORAL_BLOCK,
+    "all": "\n".join([_INVARIANTS_BLOCK, _RELATIONSHIPS_BLOCK, _TEMPORAL_BLOCK])
+}
+
 async def mine_properties(
     c_file: str, rtl_file: str, strategy: str
 ) -> List[types.TextContent]:
     """Mine properties from C and RTL code"""
     
-    properties = []
-    
-    if strategy in ["invariants", "all"]:
-        # Mine invariants
-        properties.append("// Invariants")
-        properties.append("assert(counter >= 0 && counter < MAX_COUNT);")
-        properties.append("assert(state != ERROR || error_flag);")
-    
-    if strategy in ["relationships", "all"]:
-        # Mine relationships
-        properties.append("\n// Input/Output Relationships")
-        properties.append("assert(output > input -> overflow_flag);")
-        properties.append("assert(enable -> (output != prev_output));")
-    
-    if strategy in ["temporal", "all"]:
-        # Mine temporal properties
-        properties.append("\n// Temporal Properties")
-        properties.append("property req_ack; req |-> ##[1:10] ack; endproperty")
-        properties.append("property no_deadlock; busy |-> ##[1:$] !busy; endproperty")
-    
     return [types.TextContent(
         type="text",
         text=f"""Property Mining Results:
@@ -984,7 +1004,7 @@ C File: {c_file}
 RTL File: {rtl_file}
 
 Mined Properties:
-{chr(10).join(properties)}
+{_MINED_PROPERTIES.get(strategy, "")}
 
 These properties can be used for verification with:
 - Formal verification tools
@@ -1041,8 +1061,125 @@ Coverage Type: {coverage_type}
     
     return [types.TextContent(type="text", text=coverage_report)]
 
+async def ddmin(trace: List, still_fails: Callable[[List], Awaitable[bool]]) -> List:
+    """Delta debugging: shrink a failing input sequence to a 1-minimal failing one"""
+    n = 2
+    while len(trace) >= 2:
+        bounds = [len(trace) * i // n for i in range(n + 1)]
+        chunks = [trace[bounds[i]:bounds[i + 1]] for i in range(n)]
+        complements = [trace[:bounds[i]] + trace[bounds[i + 1]:] for i in range(n)]
+        
+        # Every candidate at this granularity is independent, so test them together
+        candidates = chunks + complements
+        verdicts = await asyncio.gather(*(still_fails(c) for c in candidates))
+        
+        for i, (candidate, fails) in enumerate(zip(candidates, verdicts)):
+            if fails:
+                # A failing chunk restarts at the coarsest split, a failing complement
+                # keeps the granularity
+                trace = candidate
+                n = 2 if i < n else max(n - 1, 2)
+                break
+        else:
+            if n >= len(trace):
+                break
+            n = min(n * 2, len(trace))
+    
+    return trace
+
+def generate_replay_wrapper(c_function: str, rtl_module: str) -> str:
+    """Generate a driver replaying concrete (a, b) pairs from argv; exits 1 on mismatch"""
+    return f"""#include <cstdlib>
+#include "V{rtl_module}.h"
+
+extern "C" {{
+    int {c_function}(int a, int b);
+}}
+
+int main(int argc, char** argv) {{
+    V{rtl_module}* rtl = new V{rtl_module};
+    int status = 0;
+    
+    for (int i = 1; i + 1 < argc; i += 2) {{
+        int a = (int)strtol(argv[i], nullptr, 0);
+        int b = (int)strtol(argv[i + 1], nullptr, 0);
+        
+        int c_result = {c_function}(a, b);
+        
+        rtl->a = a;
+        rtl->b = b;
+        rtl->eval();
+        int rtl_result = rtl->sum;
+        
+        if (c_result != rtl_result) {{
+            status = 1;
+            break;
+        }}
+    }}
+    
+    delete rtl;
+    return status;
+}}"""
+
+# Concrete input pairs in a recorded counterexample, e.g. "a=0xFFFF, b=1"
+_RE_INPUT_PAIR = re.compile(r"a\s*=\s*(-?(?:0x[0-9a-fA-F]+|\d+))\D+?b\s*=\s*(-?(?:0x[0-9a-fA-F]+|\d+))")
+
+async def minimize_counterexample(result: VerificationResult, inputs: List[List[int]]) -> str:
+    """Build a replay binary for the result's design and ddmin the failing inputs"""
+    c_function = result.result.get("c_function")
+    rtl_module = result.result.get("rtl_module")
+    if not c_function or not rtl_module:
+        return "Cannot minimize: the verification did not record its C function and RTL module\n"
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wrapper_path = os.path.join(tmpdir, "replay.cpp")
+        with open(wrapper_path, 'w') as f:
+            f.write(generate_replay_wrapper(c_function, rtl_module))
+        
+        # Built once; every ddmin test is then just a run of the binary
+        build = await run_job([
+            "verilator",
+            "--cc",
+            result.rtl_file,
+            "--exe",
+            wrapper_path,
+            result.c_file,
+            "--build",
+            "--top-module", rtl_module,
+            "--Mdir", tmpdir,
+            "-o", "replay"
+        ], cwd=tmpdir)
+        if not build["success"]:
+            return f"Cannot minimize: replay build failed\n{build.get('stderr', build.get('error', ''))}\n"
+        binary = os.path.join(tmpdir, "replay")
+        
+        async def still_fails(candidate: List[List[int]]) -> bool:
+            if not candidate:
+                return False
+            argv = [str(v) for pair in candidate for v in pair[:2]]
+            async with _JOB_SEM:
+                proc = await asyncio.create_subprocess_exec(
+                    binary, *argv,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                return await proc.wait() == 1
+        
+        if not await still_fails(inputs):
+            return f"Cannot minimize: the {len(inputs)}-value input sequence does not reproduce the failure\n"
+        
+        minimized = await ddmin(inputs, still_fails)
+    
+    shown = ", ".join(f"(a={a}, b={b})" for a, b, *_ in minimized)
+    return f"""Minimized Failing Input:
+Original: input sequence of {len(inputs)} values
+Minimized: {shown}
+
+This is the smallest input that reproduces the bug.
+"""
+
 async def debug_verification(
-    result: VerificationResult, analysis_type: str
+    result: VerificationResult, analysis_type: str, inputs: Optional[List[List[int]]] = None
 ) -> List[types.TextContent]:
     """Debug failed verification"""
     
@@ -1064,12 +1201,12 @@ Divergence detected at step 2: overflow handling differs
 """
     
     elif analysis_type == "minimize":
-        debug_output += """Minimized Failing Input:
-Original: input sequence of 100 values
-Minimized: input=0xFFFF triggers the failure
-
-This is the smallest input that reproduces the bug.
-"""
+        if not inputs and result.counterexample:
+            inputs = [[int(a, 0), int(b, 0)] for a, b in _RE_INPUT_PAIR.findall(result.counterexample)]
+        if inputs:
+            debug_output += await minimize_counterexample(result, inputs)
+        else:
+            debug_output += "No failing input sequence recorded; pass `inputs` to minimize one.\n"
     
     elif analysis_type == "visualize":
         debug_output += """Visualization:
@@ -1101,13 +1238,7 @@ The verification failed because:
     
     return [types.TextContent(type="text", text=debug_output)]
 
-async def generate_report(
-    verification_ids: List[str], format_type: str
-) -> List[types.TextContent]:
-    """Generate verification report"""
-    
-    if format_type == "html":
-        report = """<!DOCTYPE html>
+_HTML_REPORT_HEADER = """<!DOCTYPE html>
 <html>
 <head>
     <title>C2RTL Verification Report</title>
@@ -1131,28 +1262,65 @@ async def generate_report(
             <th>Status</th>
         </tr>
 """
-        
-        for vid in verification_ids:
-            if vid in verification_results:
-                r = verification_results[vid]
-                status_class = "passed" if r.status == VerificationStatus.PASSED else "failed"
-                report += f"""        <tr>
-            <td>{r.id}</td>
-            <td>{os.path.basename(r.c_file)}</td>
-            <td>{os.path.basename(r.rtl_file)}</td>
-            <td>{r.method}</td>
-            <td class="{status_class}">{r.status.value}</td>
-        </tr>
-"""
-        
-        report += """    </table>
+
+_HTML_REPORT_FOOTER = """    </table>
 </body>
 </html>"""
-        
-        # Save report
+
+_HTML_REPORT_ROW = """        <tr>
+            <td>{id}</td>
+            <td>{c_file}</td>
+            <td>{rtl_file}</td>
+            <td>{method}</td>
+            <td class="{status_class}">{status}</td>
+        </tr>
+"""
+
+_MARKDOWN_REPORT_ROW = "| {id} | {c_file} | {rtl_file} | {method} | {status} |\n"
+
+# CSS class per status; anything that did not pass is shown as a failure
+_STATUS_CLASS = {status: "passed" if status == VerificationStatus.PASSED else "failed" for status in VerificationStatus}
+
+# Report rows are pure functions of the fields they show, so they are memoized
+# on those values; a result updated in place simply maps to a new entry
+@functools.lru_cache(maxsize=4096)
+def _row_html(vid: str, c_file: str, rtl_file: str, method: str, status: VerificationStatus) -> str:
+    return _HTML_REPORT_ROW.format(
+        id=vid,
+        c_file=os.path.basename(c_file),
+        rtl_file=os.path.basename(rtl_file),
+        method=method,
+        status_class=_STATUS_CLASS[status],
+        status=status.value
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _row_markdown(vid: str, c_file: str, rtl_file: str, method: str, status: VerificationStatus) -> str:
+    return _MARKDOWN_REPORT_ROW.format(
+        id=vid,
+        c_file=os.path.basename(c_file),
+        rtl_file=os.path.basename(rtl_file),
+        method=method,
+        status=status.value
+    )
+
+def _row_fields(r: VerificationResult) -> Tuple[str, str, str, str, VerificationStatus]:
+    return r.id, r.c_file, r.rtl_file, r.method, r.status
+
+async def generate_report(
+    verification_ids: List[str], format_type: str
+) -> List[types.TextContent]:
+    """Generate verification report"""
+    
+    if format_type == "html":
+        # Rows are streamed straight to the file rather than accumulated in memory
         report_path = f"/tmp/c2rtl_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        with open(report_path, 'w') as f:
-            f.write(report)
+        with open(report_path, 'w', buffering=1 << 20) as f:
+            f.write(_HTML_REPORT_HEADER)
+            for vid in verification_ids:
+                if vid in verification_results:
+                    f.write(_row_html(*_row_fields(verification_results[vid])))
+            f.write(_HTML_REPORT_FOOTER)
         
         return [types.TextContent(
             type="text",
@@ -1160,17 +1328,18 @@ async def generate_report(
         )]
     
     elif format_type == "markdown":
-        report = "# C2RTL Verification Report\n\n"
-        report += f"Generated: {datetime.datetime.now().isoformat()}\n\n"
-        report += "| ID | C File | RTL File | Method | Status |\n"
-        report += "|---|---|---|---|---|\n"
-        
-        for vid in verification_ids:
-            if vid in verification_results:
-                r = verification_results[vid]
-                report += f"| {r.id} | {os.path.basename(r.c_file)} | {os.path.basename(r.rtl_file)} | {r.method} | {r.status.value} |\n"
+        parts = [
+            "# C2RTL Verification Report\n\n",
+            f"Generated: {datetime.datetime.now().isoformat()}\n\n",
+            "| ID | C File | RTL File | Method | Status |\n",
+            "|---|---|---|---|---|\n"
+        ]
+        parts.extend(
+            _row_markdown(*_row_fields(verification_results[vid]))
+            for vid in verification_ids if vid in verification_results
+        )
         
-        return [types.TextContent(type="text", text=report)]
+        return [types.TextContent(type="text", text="".join(parts))]
     
     else:
         return [types.TextContent(
@@ -5,14 +5,18 @@ Provides tools for program verification and equivalence checking
 """
 
 import asyncio
+import collections
+import contextlib
+import hashlib
 import json
 import logging
-import subprocess
+import re
+import shlex
 import tempfile
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add debug output
 print("Starting CBMC MCP Server...", file=sys.stderr)
@@ -26,6 +30,12 @@ except ImportError as e:
     print(f"Error importing MCP modules: {e}", file=sys.stderr)
     sys.exit(1)
 
+# Optional faster JSON encoder for json-format tool results
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging to stderr for debugging
 logging.basicConfig(
     level=logging.INFO,
@@ -38,40 +48,406 @@ logger = logging.getLogger("cbmc-mcp")
 logger.info("Initializing CBMC MCP server")
 server = Server("cbmc-mcp")
 
-def run_cbmc_command(args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
-    """Execute CBMC command and return results"""
+# Cap on CBMC/goto-cc processes running at once across all requests; waiters
+# are admitted in arrival order
+MAX_JOBS = int(os.environ.get("CBMC_MAX_JOBS", os.cpu_count() or 4))
+_JOB_SEM = asyncio.Semaphore(MAX_JOBS)
+
+# Output kept per stream: the head carries the results and the first traces,
+# the tail the final verdict; anything in between is dropped as it streams by
+MAX_OUTPUT_HEAD_LINES = 2000
+MAX_OUTPUT_TAIL_LINES = 200
+
+async def _read_bounded(stream: asyncio.StreamReader) -> str:
+    """Read a pipe to EOF, keeping only its first and last lines in memory"""
+    head: List[bytes] = []
+    tail: "collections.deque[bytes]" = collections.deque(maxlen=MAX_OUTPUT_TAIL_LINES)
+    dropped = 0
+    async for line in stream:
+        if len(head) < MAX_OUTPUT_HEAD_LINES:
+            head.append(line)
+            continue
+        if len(tail) == MAX_OUTPUT_TAIL_LINES:
+            dropped += 1
+        tail.append(line)
+    if dropped:
+        head.append(f"[... {dropped} lines omitted ...]\n".encode())
+    return b"".join(head + list(tail)).decode(errors="replace")
+
+async def run_cbmc_command(args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+    """Execute CBMC command without blocking the event loop and return results"""
+    async with _JOB_SEM:
+        return await _run_cbmc(args, cwd)
+
+async def _run_cbmc(args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+    cmd = ["cbmc"] + args
+    logger.info(f"Running command: {' '.join(cmd)}")
     try:
-        cmd = ["cbmc"] + args
-        logger.info(f"Running command: {' '.join(cmd)}")
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
             cwd=cwd,
-            timeout=300  # 5 minute timeout
+            limit=1 << 20
         )
-        
+    except Exception as e:
+        logger.error(f"Error running CBMC: {e}")
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode,
+            "success": False,
+            "error": str(e),
             "command": ' '.join(cmd)
         }
-    except subprocess.TimeoutExpired:
+    
+    try:
+        stdout, stderr, _ = await asyncio.wait_for(asyncio.gather(
+            _read_bounded(proc.stdout),
+            _read_bounded(proc.stderr),
+            proc.wait()
+        ), timeout=300)  # 5 minute timeout
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
         return {
             "success": False,
             "error": "Command timed out after 5 minutes",
             "command": ' '.join(cmd)
         }
+    except asyncio.CancelledError:
+        # Don't leave an abandoned CBMC running in the background
+        proc.kill()
+        await proc.wait()
+        raise
+    
+    return {
+        "success": proc.returncode == 0,
+        "stdout": stdout,
+        "stderr": stderr,
+        "returncode": proc.returncode,
+        "command": ' '.join(cmd)
+    }
+
+# Goto-binaries compiled by goto-cc, keyed by the CBMC version and the content hash
+# of the source and its headers, least recently used first. A binary is leased while
+# a run uses it and is only evicted once no lease is left. The directory is private
+# to the user, since binaries found there are trusted
+GOTO_CACHE_DIR = Path(os.environ.get("CBMC_MCP_CACHE_DIR", "~/.cache/cbmc-mcp")).expanduser() / "gb"
+GOTO_CACHE_SIZE = 64
+_goto_cache: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+_goto_locks: Dict[str, asyncio.Lock] = {}
+_goto_leases: Dict[str, int] = {}
+
+# `cbmc --version`, probed on first use
+_cbmc_version: Optional[str] = None
+
+async def cbmc_version() -> Optional[str]:
+    """The installed CBMC version, or None if it can't be determined"""
+    global _cbmc_version
+    if _cbmc_version is None:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "cbmc", "--version",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await proc.communicate()
+        except Exception as e:
+            logger.warning(f"Cannot determine the CBMC version: {e}")
+            return None
+        if proc.returncode != 0:
+            return None
+        _cbmc_version = stdout.decode(errors="replace").strip()
+    return _cbmc_version
+
+async def _source_deps(src: str) -> Optional[List[str]]:
+    """The source file followed by every header it includes, as listed by gcc -MM"""
+    cwd = os.path.dirname(src)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "gcc", "-MM", src,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=cwd
+        )
+        stdout, _ = await proc.communicate()
     except Exception as e:
-        logger.error(f"Error running CBMC: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "command": ' '.join(cmd)
-        }
+        logger.warning(f"Cannot list headers of {src}: {e}")
+        return None
+    if proc.returncode != 0:
+        return None
+    # "target: source header ..." with line continuations and escaped spaces
+    rule = stdout.decode(errors="replace").replace("\\\n", " ")
+    return [os.path.join(cwd, dep) for dep in shlex.split(rule)[1:]]
+
+async def _get_goto_binary(src: str) -> str:
+    """Compile a C file to a cached goto-binary, falling back to the source on failure"""
+    src = os.path.abspath(src)
+    deps = await _source_deps(src)
+    version = await cbmc_version()
+    if deps is None or version is None:
+        return src
+    h = hashlib.blake2b(version.encode() + b"\0", digest_size=16)
+    try:
+        for dep in deps:
+            with open(dep, 'rb') as f:
+                h.update(dep.encode() + b"\0" + f.read() + b"\0")
+    except OSError:
+        return src
+    digest = h.hexdigest()
+    
+    lock = _goto_locks.setdefault(digest, asyncio.Lock())
+    try:
+        async with lock:
+            gb_path = str(GOTO_CACHE_DIR / f"{digest}.gb")
+            if not os.path.exists(gb_path):
+                GOTO_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=GOTO_CACHE_DIR, suffix=".tmp")
+                os.close(fd)
+                try:
+                    async with _JOB_SEM:
+                        proc = await asyncio.create_subprocess_exec(
+                            "goto-cc", "-o", tmp_path, src,
+                            stdout=asyncio.subprocess.DEVNULL,
+                            stderr=asyncio.subprocess.PIPE,
+                            cwd=os.path.dirname(src)
+                        )
+                        _, stderr = await proc.communicate()
+                    if proc.returncode != 0:
+                        logger.warning(f"goto-cc failed on {src}: {stderr.decode(errors='replace')}")
+                        return src
+                    os.replace(tmp_path, gb_path)
+                except Exception as e:
+                    logger.warning(f"goto-cc unavailable, verifying source directly: {e}")
+                    return src
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+            
+            _goto_cache[digest] = gb_path
+            _goto_cache.move_to_end(digest)
+            _goto_leases[gb_path] = _goto_leases.get(gb_path, 0) + 1
+            _evict_goto_binaries()
+    finally:
+        # Locks are only kept for binaries that are cached
+        if digest not in _goto_cache and not lock.locked():
+            _goto_locks.pop(digest, None)
+    
+    return gb_path
+
+def _release_goto_binary(path: str) -> None:
+    """Return a lease taken by _get_goto_binary"""
+    if path not in _goto_leases:
+        return
+    _goto_leases[path] -= 1
+    if not _goto_leases[path]:
+        del _goto_leases[path]
+        _evict_goto_binaries()
+
+def _evict_goto_binaries() -> None:
+    """Drop least recently used binaries beyond GOTO_CACHE_SIZE that no run is using"""
+    for digest, path in list(_goto_cache.items()):
+        if len(_goto_cache) <= GOTO_CACHE_SIZE:
+            break
+        if path in _goto_leases:
+            continue
+        del _goto_cache[digest]
+        lock = _goto_locks.get(digest)
+        if lock is not None and not lock.locked():
+            del _goto_locks[digest]
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+@contextlib.asynccontextmanager
+async def goto_binary(src: str):
+    """The cached goto-binary for src, kept on disk for the duration of the block"""
+    path = await _get_goto_binary(src)
+    try:
+        yield path
+    finally:
+        _release_goto_binary(path)
+
+# Shared "format" tool argument: human-readable text or a compact JSON object
+_FORMAT_PROPERTY = {
+    "type": "string",
+    "description": "Result format: readable text or a compact JSON object",
+    "enum": ["text", "json"],
+    "default": "text"
+}
+
+def dumps_compact(payload: Any) -> str:
+    """Serialize a tool result as compact JSON"""
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, separators=(',', ':'))
+
+def result_payload(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a run_cbmc_command result that json-format replies carry"""
+    if result['success']:
+        status = "success"
+    else:
+        status = "error" if "error" in result else "failed"
+    return {
+        "status": status,
+        "command": result.get("command"),
+        "returncode": result.get("returncode"),
+        "stdout": result.get("stdout", ""),
+        "stderr": result.get("stderr", ""),
+        "error": result.get("error")
+    }
+
+# Comments and string/char literals, blanked out (offsets preserved) before scanning C
+_RE_C_NOISE = re.compile(r'/\*.*?\*/|//[^\n]*|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'', re.S)
+_RE_FUNC_HEADER = re.compile(r'\b(\w+)\s*\([^;{}]*\)\s*$')
+_RE_IDENT = re.compile(r'\b[A-Za-z_]\w*\b')
+_RE_PREPROCESSOR_LINE = re.compile(r'^[ \t]*#.*$', re.M)
+_RE_PROTOTYPE = re.compile(r'\b(\w+)\s*\([^;{}=]*\)\s*;')
+
+# Sliced sources keyed by (content hash, function name)
+_slice_cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+def _function_spans(source: str) -> Dict[str, Tuple[int, int]]:
+    """Locate top-level function definitions in C source by brace matching"""
+    masked = _RE_C_NOISE.sub(lambda m: re.sub(r'[^\n]', ' ', m.group()), source)
+    spans = {}
+    depth = 0
+    item_start = 0
+    header_start = 0
+    name = None
+    for m in re.finditer(r'[{};]', masked):
+        ch = m.group()
+        if depth == 0 and ch == ';':
+            item_start = m.end()
+        elif ch == '{':
+            if depth == 0:
+                header = _RE_FUNC_HEADER.search(masked, item_start, m.start())
+                name = header.group(1) if header else None
+                # Preprocessor lines between the previous item and this one stay put
+                header_start = item_start
+                for line in masked[item_start:m.start()].splitlines(keepends=True):
+                    if line.strip() and not line.lstrip().startswith('#'):
+                        break
+                    header_start += len(line)
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                if name:
+                    spans[name] = (header_start, m.end())
+                name = None
+                item_start = m.end()
+    return spans
+
+def _slice_function(path: str, function: str) -> Optional[str]:
+    """The source of `path` without the bodies `function` can never reach, or None"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    key = (hashlib.blake2b(data, digest_size=16).hexdigest(), function)
+    if key in _slice_cache:
+        return _slice_cache[key]
+    
+    source = data.decode(errors="replace")
+    spans = _function_spans(source)
+    sliced = None
+    if function in spans:
+        # Keep every function transitively referenced from the target, plus all
+        # declarations, types and macros; drop the remaining definitions. Names used
+        # outside function bodies (macro expansions, function-pointer initializers)
+        # are reachable too; a prototype alone doesn't make its function reachable
+        masked = _RE_C_NOISE.sub(lambda m: re.sub(r'[^\n]', ' ', m.group()), source)
+        for start, end in spans.values():
+            masked = masked[:start] + re.sub(r'[^\n]', ' ', masked[start:end]) + masked[end:]
+        declarations = _RE_PROTOTYPE.sub('', _RE_PREPROCESSOR_LINE.sub('', masked))
+        used = set(_RE_IDENT.findall(declarations))
+        used.update(_RE_IDENT.findall('\n'.join(_RE_PREPROCESSOR_LINE.findall(masked))))
+        reachable = {function} | {name for name in spans if name in used}
+        pending = list(reachable)
+        while pending:
+            start, end = spans[pending.pop()]
+            for ident in set(_RE_IDENT.findall(source, start, end)):
+                if ident in spans and ident not in reachable:
+                    reachable.add(ident)
+                    pending.append(ident)
+        sliced = source
+        for start, end in sorted((span for name, span in spans.items() if name not in reachable), reverse=True):
+            sliced = sliced[:start] + sliced[end:]
+    
+    _slice_cache[key] = sliced
+    return sliced
+
+# CBMC flags enabling each cbmc_verify property. CBMC checks assertions
+# unconditionally, so "assertions" adds no instrumentation at all
+_PROPERTY_FLAGS: Dict[str, Tuple[str, ...]] = {
+    "all": ("--bounds-check", "--pointer-check", "--div-by-zero-check",
+            "--signed-overflow-check", "--unsigned-overflow-check"),
+    "bounds": ("--bounds-check",),
+    "pointer": ("--pointer-check",),
+    "overflow": ("--signed-overflow-check", "--unsigned-overflow-check"),
+    "div-by-zero": ("--div-by-zero-check",),
+    "assertions": ()
+}
+
+# Property classes checked by separate, concurrent CBMC runs for property "all";
+# each run solves a smaller formula than one run carrying every check. User
+# assertions are checked by the first class only
+_PROPERTY_CLASSES = ("bounds", "pointer", "div-by-zero", "overflow")
+
+async def run_property_classes(
+    file_path: str, function: str, unwind: int, trace: bool, stop_on_failure: bool = False
+) -> Dict[str, Any]:
+    """Run one CBMC per property class in parallel and merge the results"""
+    tasks = {
+        asyncio.create_task(run_cbmc_command(
+            build_verify_args(file_path, function, unwind, property, trace)
+            + ([] if property == _PROPERTY_CLASSES[0] else ["--no-assertions"])
+        )): property
+        for property in _PROPERTY_CLASSES
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+            if stop_on_failure and any(not r['success'] for r in results.values()):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    ran = [property for property in _PROPERTY_CLASSES if property in results]
+    skipped = [property for property in _PROPERTY_CLASSES if property not in results]
+    sections = [f"--- {p} ---\n{results[p].get('stdout', '')}" for p in ran]
+    if skipped:
+        sections.append(f"--- not checked after first failure: {', '.join(skipped)} ---")
+    merged = {
+        "success": not skipped and all(results[p]['success'] for p in ran),
+        "command": "; ".join(results[p].get('command', '') for p in ran),
+        "stdout": "\n".join(sections),
+        "stderr": "\n".join(results[p].get('stderr', '') for p in ran if results[p].get('stderr')),
+        "returncode": max((results[p].get('returncode') or 0 for p in ran), default=0)
+    }
+    errors = [f"{p}: {results[p]['error']}" for p in ran if results[p].get('error')]
+    if errors:
+        merged["error"] = "\n".join(errors)
+    return merged
+
+def build_verify_args(file_path: str, function: str, unwind: int, property: str, trace: bool) -> List[str]:
+    """Build the CBMC argument list for a cbmc_verify-style check"""
+    args = [file_path, f"--function={function}", f"--unwind={unwind}"]
+    
+    # Add property checks
+    if property not in _PROPERTY_FLAGS:
+        raise ValueError(f"Unknown property '{property}'")
+    args.extend(_PROPERTY_FLAGS[property])
+    
+    if trace:
+        args.append("--trace")
+    
+    return args
 
 @server.list_tools()
 async def list_tools() -> List[types.Tool]:
@@ -107,7 +483,13 @@ async def list_tools() -> List[types.Tool]:
                         "type": "boolean",
                         "description": "Show counterexample trace",
                         "default": True
-                    }
+                    },
+                    "stop_on_failure": {
+                        "type": "boolean",
+                        "description": "With property 'all', stop the remaining checks at the first failure",
+                        "default": False
+                    },
+                    "format": _FORMAT_PROPERTY
                 },
                 "required": ["file"]
             }
@@ -139,10 +521,47 @@ async def list_tools() -> List[types.Tool]:
                         "type": "array",
                         "description": "List of input variable names to make non-deterministic",
                         "items": {"type": "string"}
-                    }
+                    },
+                    "format": _FORMAT_PROPERTY
                 },
                 "required": ["file1", "file2", "function"]
             }
+        ),
+        types.Tool(
+            name="cbmc_batch_verify",
+            description="Verify several C/C++ files in parallel with the same CBMC options",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "files": {
+                        "type": "array",
+                        "description": "Paths to C/C++ files to verify",
+                        "items": {"type": "string"}
+                    },
+                    "function": {
+                        "type": "string",
+                        "description": "Entry point function (default: main)"
+                    },
+                    "unwind": {
+                        "type": "integer",
+                        "description": "Loop unwinding bound",
+                        "default": 10
+                    },
+                    "property": {
+                        "type": "string",
+                        "description": "Property to check",
+                        "enum": ["assertions", "bounds", "pointer", "overflow", "div-by-zero", "all"],
+                        "default": "all"
+                    },
+                    "trace": {
+                        "type": "boolean",
+                        "description": "Show counterexample traces",
+                        "default": False
+                    },
+                    "format": _FORMAT_PROPERTY
+                },
+                "required": ["files"]
+            }
         )
     ]
 
@@ -160,26 +579,19 @@ async def call_tool(name: str, arguments: Any) -> List[types.TextContent | types
         unwind = arguments.get("unwind", 10)
         property = arguments.get("property", "all")
         trace = arguments.get("trace", True)
+        if property not in _PROPERTY_FLAGS:
+            return [types.TextContent(type="text", text=f"Error: unknown property '{property}'")]
         
-        args = [file_path, f"--function={function}", f"--unwind={unwind}"]
+        async with goto_binary(file_path) as binary:
+            if property == "all":
+                result = await run_property_classes(
+                    binary, function, unwind, trace, arguments.get("stop_on_failure", False)
+                )
+            else:
+                result = await run_cbmc_command(build_verify_args(binary, function, unwind, property, trace))
         
-        # Add property checks
-        if property == "all":
-            args.extend(["--bounds-check", "--pointer-check", "--div-by-zero-check", 
-                        "--signed-overflow-check", "--unsigned-overflow-check"])
-        elif property == "bounds":
-            args.append("--bounds-check")
-        elif property == "pointer":
-            args.append("--pointer-check")
-        elif property == "overflow":
-            args.extend(["--signed-overflow-check", "--unsigned-overflow-check"])
-        elif property == "div-by-zero":
-            args.append("--div-by-zero-check")
-        
-        if trace:
-            args.append("--trace")
-        
-        result = run_cbmc_command(args)
+        if arguments.get("format") == "json":
+            return [types.TextContent(type="text", text=dumps_compact(result_payload(result)))]
         
         return [types.TextContent(
             type="text",
@@ -201,25 +613,37 @@ async def call_tool(name: str, arguments: Any) -> List[types.TextContent | types
             
         unwind = arguments.get("unwind", 10)
         inputs = arguments.get("inputs", [])
+        abs1 = os.path.abspath(file1)
+        abs2 = os.path.abspath(file2)
         
-        # Create equivalence checking harness
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.c', delete=False) as f:
-            harness_code = f"""#include <assert.h>
-
-// Forward declarations
-int {function}(int);
-
-// Implementation 1
-#define IMPL1
-#include "{os.path.abspath(file1)}"
-#undef IMPL1
-int {function}_v1(int x) {{ return {function}(x); }}
+        # Each implementation is compiled once, as its own translation unit with the
+        # function renamed, so the two definitions never collide
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Only the compared function and what it reaches is handed to CBMC;
+            # files the slicer cannot handle are included whole
+            sources = []
+            include_dirs = []
+            for suffix, source in (("v1", abs1), ("v2", abs2)):
+                sliced = _slice_function(source, function)
+                wrapper_path = os.path.join(tmpdir, f"{suffix}.c")
+                with open(wrapper_path, 'w') as f:
+                    f.write(f'#define {function} {function}_{suffix}\n')
+                    if sliced is None:
+                        f.write(f'#include "{source}"\n')
+                    else:
+                        f.write(sliced)
+                sources.append(wrapper_path)
+                # Quoted includes in a sliced copy still resolve next to the original
+                source_dir = os.path.dirname(source)
+                if source_dir not in include_dirs:
+                    include_dirs.append(source_dir)
+            
+            harness_path = os.path.join(tmpdir, "harness.c")
+            with open(harness_path, 'w') as f:
+                f.write(f"""#include <assert.h>
 
-// Implementation 2  
-#define IMPL2
-#include "{os.path.abspath(file2)}"
-#undef IMPL2
-int {function}_v2(int x) {{ return {function}(x); }}
+extern int {function}_v1(int);
+extern int {function}_v2(int);
 
 int main() {{
     int x;  // Non-deterministic input
@@ -232,16 +656,18 @@ int main() {{
     
     return 0;
 }}
-"""
-            f.write(harness_code)
-            harness_path = f.name
-        
-        try:
-            args = [harness_path, "--unwind", str(unwind), "--trace"]
-            result = run_cbmc_command(args)
+""")
+            
+            args = [harness_path] + sources + [f"-I{d}" for d in include_dirs] + ["--unwind", str(unwind), "--trace"]
+            result = await run_cbmc_command(args)
             
             equivalence = "EQUIVALENT" if result['success'] else "NOT EQUIVALENT"
             
+            if arguments.get("format") == "json":
+                payload = result_payload(result)
+                payload["equivalence"] = equivalence
+                return [types.TextContent(type="text", text=dumps_compact(payload))]
+            
             return [types.TextContent(
                 type="text",
                 text=f"Equivalence Checking Results:\n\n"
@@ -252,8 +678,52 @@ int main() {{
                      f"{result.get('stderr', '')}\n"
                      f"{result.get('error', '')}"
             )]
-        finally:
-            os.unlink(harness_path)
+    
+    elif name == "cbmc_batch_verify":
+        files = arguments.get("files")
+        if not files:
+            return [types.TextContent(type="text", text="Error: 'files' parameter is required")]
+        
+        function = arguments.get("function", "main")
+        unwind = arguments.get("unwind", 10)
+        property = arguments.get("property", "all")
+        trace = arguments.get("trace", False)
+        if property not in _PROPERTY_FLAGS:
+            return [types.TextContent(type="text", text=f"Error: unknown property '{property}'")]
+        
+        # Every run is independent; run_cbmc_command caps how many are in flight
+        async def verify_one(file_path: str) -> Dict[str, Any]:
+            async with goto_binary(file_path) as binary:
+                return await run_cbmc_command(build_verify_args(binary, function, unwind, property, trace))
+        
+        results = await asyncio.gather(*(verify_one(file_path) for file_path in files))
+        
+        if arguments.get("format") == "json":
+            return [types.TextContent(type="text", text=dumps_compact([
+                {"file": file_path, **result_payload(result)} for file_path, result in zip(files, results)
+            ]))]
+        
+        passed = sum(1 for result in results if result['success'])
+        summary = "\n".join(
+            f"  {'SUCCESS' if result['success'] else 'FAILED'}: {file_path}"
+            for file_path, result in zip(files, results)
+        )
+        details = "\n".join(
+            f"=== {file_path} ===\n"
+            f"Command: {result.get('command', 'N/A')}\n\n"
+            f"{result.get('stdout', '')}\n"
+            f"{result.get('stderr', '')}\n"
+            f"{result.get('error', '')}"
+            for file_path, result in zip(files, results)
+        )
+        
+        return [types.TextContent(
+            type="text",
+            text=f"CBMC Batch Verification Results:\n\n"
+                 f"{passed}/{len(files)} files verified\n\n"
+                 f"{summary}\n\n"
+                 f"{details}"
+        )]
     
     else:
         return [types.TextContent(
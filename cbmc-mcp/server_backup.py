@@ -5,13 +5,20 @@ Provides tools for program verification and equivalence checking
 """
 
 import asyncio
+import codecs
+import collections
+import contextlib
+import hashlib
 import json
 import logging
-import subprocess
+import shlex
+import shutil
 import tempfile
+import time
 import os
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from mcp.server import Server
 from mcp.types import Tool, TextContent, ImageContent, EmbeddedResource
 from mcp.server.stdio import stdio_server
@@ -23,39 +30,490 @@ logger = logging.getLogger("cbmc-mcp")
 # Initialize MCP server
 app = Server("cbmc-mcp")
 
-def run_cbmc_command(args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
-    """Execute CBMC command and return results"""
+# CBMC is CPU-bound, so at most one run per core is in flight
+_CBMC_SLOTS = asyncio.Semaphore(os.cpu_count() or 1)
+
+# Finished CBMC runs, keyed by the contents of their input files plus the
+# remaining arguments, so an unchanged check is answered from disk
+CACHE_DIR = Path(os.environ.get("CBMC_MCP_CACHE_DIR", "~/.cache/cbmc-mcp")).expanduser()
+
+# At most this many results are kept on disk; the least recently used go first
+RESULT_CACHE_ENTRIES = 4096
+RESULT_CACHE_PRUNE_EVERY = 256
+_cache_writes = 0
+
+# The same results held in memory for this session, least recently used first
+_RESULT_MEMO_SIZE = 256
+_result_memo: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+
+# path -> (mtime_ns, size, digest); files whose stat is unchanged are not re-hashed
+_digest_memo: Dict[str, Tuple[int, int, str]] = {}
+
+def _file_digest(path: str) -> str:
+    st = os.stat(path)
+    memo = _digest_memo.get(path)
+    if memo is not None and memo[0] == st.st_mtime_ns and memo[1] == st.st_size:
+        return memo[2]
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _digest_memo[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+# path -> [(dependency, mtime_ns, size)] as listed by the preprocessor; reused while
+# none of the listed files has changed
+_deps_memo: Dict[str, List[Tuple[str, int, int]]] = {}
+
+def _stamp(path: str) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return (path, st.st_mtime_ns, st.st_size)
+
+async def _source_deps(path: str) -> Optional[List[str]]:
+    """The source file followed by every header it includes, or None if they can't be listed"""
+    path = os.path.abspath(path)
+    memo = _deps_memo.get(path)
+    if memo is not None:
+        try:
+            if [_stamp(dep) for dep, _, _ in memo] == memo:
+                return [dep for dep, _, _ in memo]
+        except OSError:
+            pass
+    
+    cwd = os.path.dirname(path)
     try:
-        cmd = ["cbmc"] + args
-        logger.info(f"Running command: {' '.join(cmd)}")
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=cwd,
-            timeout=300  # 5 minute timeout
+        proc = await asyncio.create_subprocess_exec(
+            "gcc", "-MM", path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=cwd
         )
-        
-        return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode,
-            "command": ' '.join(cmd)
-        }
-    except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "error": "Command timed out after 5 minutes",
-            "command": ' '.join(cmd)
-        }
+        stdout, _ = await proc.communicate()
     except Exception as e:
+        logger.warning("Cannot list headers of %s: %s", path, e)
+        return None
+    if proc.returncode != 0:
+        return None
+    
+    # "target: source header ..." with line continuations and escaped spaces
+    rule = stdout.decode(errors="replace").replace("\\\n", " ")
+    deps = [os.path.join(cwd, dep) for dep in shlex.split(rule)[1:]]
+    try:
+        _deps_memo[path] = [_stamp(dep) for dep in deps]
+    except OSError:
+        return None
+    return deps
+
+async def _input_digest(path: str) -> Optional[str]:
+    """Digest of a CBMC input: goto-binaries by their bytes, sources with their headers"""
+    if is_goto_binary(path):
+        return _file_digest(path)
+    deps = await _source_deps(path)
+    if deps is None:
+        return None
+    h = hashlib.blake2b(digest_size=20)
+    for dep in deps:
+        h.update(dep.encode() + b"=" + _file_digest(dep).encode() + b"\0")
+    return h.hexdigest()
+
+# `cbmc --version`, part of every cache key so results don't outlive an upgrade
+_cbmc_version: Optional[str] = None
+
+async def cbmc_version() -> Optional[str]:
+    """The installed CBMC version, or None if it can't be determined"""
+    global _cbmc_version
+    if _cbmc_version is None:
+        result = await _run_cbmc(["--version"])
+        if "error" in result or result["returncode"] != 0:
+            return None
+        _cbmc_version = result["stdout"].strip()
+    return _cbmc_version
+
+async def _result_cache_key(args: List[str], cwd: Optional[str], inputs: List[str]) -> Optional[str]:
+    """Key for a CBMC run, or None when it has no input files to key on"""
+    paths = [os.path.join(cwd or "", arg) for arg in args]
+    if not any(os.path.isfile(path) for path in paths):
+        return None
+    version = await cbmc_version()
+    if version is None:
+        return None
+    h = hashlib.blake2b(digest_size=20)
+    h.update(version.encode() + b"\0")
+    try:
+        # File arguments count by contents, so temporary harness paths don't matter
+        for arg, path in zip(args, paths):
+            if os.path.isfile(path):
+                digest = await _input_digest(path)
+                if digest is None:
+                    return None
+                h.update(b"file:" + digest.encode())
+            else:
+                h.update(arg.encode())
+            h.update(b"\0")
+        for path in inputs:
+            digest = await _input_digest(path)
+            if digest is None:
+                return None
+            h.update(b"input:" + digest.encode() + b"\0")
+    except OSError:
+        return None
+    return h.hexdigest()
+
+async def run_cbmc_command(
+    args: List[str], cwd: Optional[str] = None, inputs: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Execute CBMC command without blocking the event loop and return results"""
+    # inputs: files CBMC reads indirectly (e.g. via a harness #include)
+    key = await _result_cache_key(args, cwd, inputs or [])
+    if key is not None:
+        if key in _result_memo:
+            _result_memo.move_to_end(key)
+            return dict(_result_memo[key])
+        try:
+            cache_path = CACHE_DIR / f"{key}.json"
+            with open(cache_path) as f:
+                result = json.load(f)
+            # The mtime records the last use, which is what pruning goes by
+            os.utime(cache_path)
+            _remember_result(key, result)
+            return dict(result)
+        except (OSError, ValueError):
+            pass
+    
+    result = await _run_cbmc(args, cwd)
+    
+    # Launch failures and timeouts say nothing about the program, so they aren't kept
+    if key is not None and "error" not in result:
+        _remember_result(key, result)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+                json.dump(result, f)
+            os.replace(f.name, CACHE_DIR / f"{key}.json")
+        except OSError as e:
+            logger.warning("Failed to cache CBMC result: %s", e)
+        
+        global _cache_writes
+        _cache_writes += 1
+        if _cache_writes % RESULT_CACHE_PRUNE_EVERY == 0:
+            prune_result_cache()
+    
+    return result
+
+def _remember_result(key: str, result: Dict[str, Any]) -> None:
+    _result_memo[key] = result
+    if len(_result_memo) > _RESULT_MEMO_SIZE:
+        _result_memo.popitem(last=False)
+
+def _prune_lru(directory: Path, pattern: str, keep: int) -> None:
+    """Delete all but the keep most recently used files matching pattern in directory"""
+    try:
+        entries = sorted(directory.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in entries[keep:]:
+        try:
+            entry.unlink()
+        except OSError as e:
+            logger.warning("Failed to prune %s: %s", entry, e)
+
+def prune_result_cache() -> None:
+    """Bound the on-disk result cache"""
+    _prune_lru(CACHE_DIR, "*.json", RESULT_CACHE_ENTRIES)
+
+async def _run_cbmc(args: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+    cmd = ["cbmc"] + args
+    command = shlex.join(cmd)
+    logger.info("Running command: %s", command)
+    
+    async with _CBMC_SLOTS:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd
+            )
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "command": command
+            }
+        
+        # --json-ui output is folded into a summary as it arrives instead of being buffered
+        json_ui = "--json-ui" in args
+        reader = _read_json_ui(proc.stdout) if json_ui else proc.stdout.read()
+        
+        # Awaited from a coroutine so that, when cancelled, the gather's outcome is consumed
+        async def collect():
+            return await asyncio.gather(reader, proc.stderr.read(), proc.wait())
+        
+        try:
+            stdout, stderr, _ = await asyncio.wait_for(collect(), timeout=300)  # 5 minute timeout
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return {
+                "success": False,
+                "error": "Command timed out after 5 minutes",
+                "command": command
+            }
+        except asyncio.CancelledError:
+            proc.kill()
+            await proc.wait()
+            raise
+    
+    if json_ui:
         return {
-            "success": False,
-            "error": str(e),
-            "command": ' '.join(cmd)
+            "success": proc.returncode == 0,
+            "stdout": "",
+            "summary": stdout,
+            "stderr": stderr.decode(errors="replace"),
+            "returncode": proc.returncode,
+            "command": command
         }
+    
+    return {
+        "success": proc.returncode == 0,
+        "stdout": stdout.decode(errors="replace"),
+        "stderr": stderr.decode(errors="replace"),
+        "returncode": proc.returncode,
+        "command": command
+    }
+
+# At most this many CBMC errors/warnings are kept from a --json-ui run
+_MAX_JSON_MESSAGES = 50
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _fold_json_message(summary: Dict[str, Any], message: Any) -> None:
+    """Add one --json-ui message to a run summary; only the first failing trace is kept"""
+    if not isinstance(message, dict):
+        return
+    
+    for prop in message.get("result", []):
+        status = prop.get("status")
+        if status == "SUCCESS":
+            summary["passed"] += 1
+        elif status == "FAILURE":
+            summary["failed"] += 1
+            if summary["first_failure"] is None:
+                summary["first_failure"] = prop
+        else:
+            summary["unknown"] += 1
+    
+    summary["goals"].extend(message.get("goals", []))
+    summary["tests"].extend(message.get("tests", []))
+    
+    if "cProverStatus" in message:
+        summary["status"] = message["cProverStatus"]
+    if message.get("messageType") in ("ERROR", "WARNING") and len(summary["messages"]) < _MAX_JSON_MESSAGES:
+        summary["messages"].append(f"{message['messageType']}: {message.get('messageText', '')}")
+
+def _fold_json_text(summary: Dict[str, Any], text: str) -> str:
+    """Fold every complete message in text into summary and return the unparsed rest"""
+    pos = 0
+    while True:
+        # Skip the array brackets and the separators between messages
+        while pos < len(text) and text[pos] in " \t\r\n[,]":
+            pos += 1
+        if pos == len(text):
+            return ""
+        try:
+            message, pos = _JSON_DECODER.raw_decode(text, pos)
+        except ValueError:
+            return text[pos:]
+        _fold_json_message(summary, message)
+
+async def _read_json_ui(stream: asyncio.StreamReader) -> Dict[str, Any]:
+    """Summarise CBMC's --json-ui message array while it streams in"""
+    summary = {
+        "status": None, "passed": 0, "failed": 0, "unknown": 0,
+        "first_failure": None, "messages": [], "goals": [], "tests": []
+    }
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending: List[str] = []
+    partial = ""
+    
+    while True:
+        chunk = await stream.read(1 << 16)
+        lines = (partial + decoder.decode(chunk, final=not chunk)).split("\n")
+        partial = lines.pop() if chunk else ""
+        for line in lines:
+            pending.append(line)
+            # Top-level messages close at an indentation of at most two spaces; only
+            # then is a parse attempted, so a long trace isn't re-parsed line by line
+            if line.rstrip().rstrip(",").endswith(("}", "]")) and len(line) - len(line.lstrip()) <= 2:
+                rest = _fold_json_text(summary, "\n".join(pending))
+                pending = [rest] if rest else []
+        if not chunk:
+            break
+    
+    if pending:
+        _fold_json_text(summary, "\n".join(pending))
+    return summary
+
+def format_json_summary(summary: Dict[str, Any], trace: bool) -> str:
+    """Condensed report of a --json-ui run: counts, first failure and its trace"""
+    counts = f"Properties: {summary['passed']} passed, {summary['failed']} failed"
+    if summary["unknown"]:
+        counts += f", {summary['unknown']} unknown"
+    lines = [counts]
+    
+    failure = summary["first_failure"]
+    if failure is not None:
+        lines.append(f"First failure: [{failure.get('property', '?')}] {failure.get('description', '')}")
+        if trace:
+            for step in failure.get("trace", []):
+                if step.get("stepType") == "assignment" and not step.get("hidden"):
+                    location = step.get("sourceLocation", {})
+                    value = step.get("value", {}).get("data", "?")
+                    lines.append(f"  {location.get('file', '?')}:{location.get('line', '?')} "
+                                 f"{step.get('lhs', '?')} = {value}")
+    
+    lines.extend(summary["messages"])
+    return "\n".join(lines)
+
+# goto-cc output kept next to the result cache, keyed by the digest of the source and
+# its headers; entries made this session are evicted least recently used first once
+# no run holds a lease on them, and at most GOTO_CACHE_ENTRIES survive a restart
+GOTO_CACHE_DIR = CACHE_DIR / "gb"
+GOTO_CACHE_SIZE = 64
+GOTO_CACHE_ENTRIES = 512
+_goto_cache: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+_goto_locks: Dict[str, asyncio.Lock] = {}
+_goto_leases: Dict[str, int] = {}
+
+# goto-cc output: recognised by file suffix or by the goto-binary magic number
+GOTO_BINARY_SUFFIXES = (".gb", ".goto")
+GOTO_BINARY_MAGIC = b"\x7fGBF"
+
+def is_goto_binary(path: str) -> bool:
+    """Whether path is already a goto-binary that CBMC can load without its frontend"""
+    if path.endswith(GOTO_BINARY_SUFFIXES):
+        return True
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(GOTO_BINARY_MAGIC)) == GOTO_BINARY_MAGIC
+    except OSError:
+        return False
+
+async def ensure_goto_binary(src: str) -> str:
+    """Compile a C file to a cached goto-binary, falling back to the source on failure"""
+    # Pre-built goto-binaries are passed to CBMC as they are
+    if is_goto_binary(src):
+        return src
+    
+    try:
+        digest = await _input_digest(src)
+    except OSError:
+        return src
+    version = await cbmc_version()
+    if digest is None or version is None:
+        return src
+    digest = hashlib.blake2b((version + digest).encode(), digest_size=20).hexdigest()
+    
+    lock = _goto_locks.setdefault(digest, asyncio.Lock())
+    async with lock:
+        gb_path = str(GOTO_CACHE_DIR / f"{digest}.gb")
+        if not os.path.exists(gb_path):
+            GOTO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{gb_path}.{os.getpid()}.tmp"
+            abs_src = os.path.abspath(src)
+            try:
+                async with _CBMC_SLOTS:
+                    proc = await asyncio.create_subprocess_exec(
+                        "goto-cc", "-o", tmp_path, abs_src,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.PIPE,
+                        cwd=os.path.dirname(abs_src)
+                    )
+                    _, stderr = await proc.communicate()
+            except Exception as e:
+                logger.warning("goto-cc unavailable, verifying source directly: %s", e)
+                return src
+            if proc.returncode != 0:
+                logger.warning("goto-cc failed on %s: %s", src, stderr.decode(errors='replace'))
+                return src
+            os.replace(tmp_path, gb_path)
+        else:
+            os.utime(gb_path)
+        
+        _goto_cache[digest] = gb_path
+        _goto_cache.move_to_end(digest)
+        _goto_leases[gb_path] = _goto_leases.get(gb_path, 0) + 1
+        _evict_goto_binaries()
+    
+    return gb_path
+
+def _release_goto_binary(path: str) -> None:
+    """Return a lease taken by ensure_goto_binary"""
+    if path not in _goto_leases:
+        return
+    _goto_leases[path] -= 1
+    if not _goto_leases[path]:
+        del _goto_leases[path]
+        _evict_goto_binaries()
+
+def _evict_goto_binaries() -> None:
+    """Drop least recently used binaries beyond GOTO_CACHE_SIZE that no run is using"""
+    for digest, path in list(_goto_cache.items()):
+        if len(_goto_cache) <= GOTO_CACHE_SIZE:
+            break
+        if path in _goto_leases:
+            continue
+        del _goto_cache[digest]
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+@contextlib.asynccontextmanager
+async def goto_binary(src: str):
+    """The goto-binary for src, kept on disk until the block exits"""
+    path = await ensure_goto_binary(src)
+    try:
+        yield path
+    finally:
+        _release_goto_binary(path)
+
+# Equivalence harnesses, one directory per query shape; directories unused for
+# HARNESS_MAX_AGE seconds are pruned when the server starts
+HARNESS_DIR = CACHE_DIR / "harness"
+HARNESS_MAX_AGE = 24 * 3600
+
+def _write_once(path: Path, text: str) -> None:
+    """Create path with text unless it exists; readers never see a partial file"""
+    if path.exists():
+        return
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+def prune_harnesses(max_age: float = HARNESS_MAX_AGE) -> None:
+    """Remove harness directories not used within max_age seconds"""
+    cutoff = time.time() - max_age
+    if not HARNESS_DIR.is_dir():
+        return
+    for entry in HARNESS_DIR.iterdir():
+        try:
+            if entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry)
+        except OSError as e:
+            logger.warning("Failed to prune %s: %s", entry, e)
+
+# Whether the installed CBMC offers --json-ui; probed on first use
+_json_ui_supported: Optional[bool] = None
+
+async def cbmc_supports_json_ui() -> bool:
+    """Whether the installed CBMC offers --json-ui; checked once per process"""
+    global _json_ui_supported
+    if _json_ui_supported is None:
+        result = await run_cbmc_command(["--help"])
+        _json_ui_supported = "--json-ui" in result.get("stdout", "") + result.get("stderr", "")
+    return _json_ui_supported
 
 @app.list_tools()
 async def list_tools() -> List[Tool]:
@@ -69,7 +527,7 @@ async def list_tools() -> List[Tool]:
                 "properties": {
                     "file": {
                         "type": "string",
-                        "description": "Path to C/C++ file to verify"
+                        "description": "Path to C/C++ file to verify, or a goto-binary (.gb/.goto) built by goto-cc"
                     },
                     "function": {
                         "type": "string",
@@ -77,19 +535,40 @@ async def list_tools() -> List[Tool]:
                     },
                     "unwind": {
                         "type": "integer",
-                        "description": "Loop unwinding bound",
+                        "description": "Loop unwinding bound (for loops not listed in loop_unwinds)",
                         "default": 10
                     },
+                    "loop_unwinds": {
+                        "type": "object",
+                        "description": "Per-loop unwinding bounds keyed by loop id, e.g. {\"main.0\": 100}",
+                        "additionalProperties": {"type": "integer"}
+                    },
+                    "partial_loops": {
+                        "type": "boolean",
+                        "description": "Allow paths past the unwinding bound (faster, unsound)",
+                        "default": False
+                    },
+                    "unwinding_assertions": {
+                        "type": "boolean",
+                        "description": "Check that the unwinding bounds are large enough",
+                        "default": False
+                    },
                     "property": {
                         "type": "string",
-                        "description": "Property to check",
+                        "description": "Property to check ('all' runs each check class in parallel; "
+                                       "with stop_on_failure it reports only up to the first failure)",
                         "enum": ["assertions", "bounds", "pointer", "overflow", "div-by-zero", "all"],
                         "default": "all"
                     },
                     "trace": {
                         "type": "boolean",
-                        "description": "Show counterexample trace",
-                        "default": True
+                        "description": "Show the counterexample trace of the first failing property",
+                        "default": False
+                    },
+                    "stop_on_failure": {
+                        "type": "boolean",
+                        "description": "Stop at the first failing property instead of listing every failure",
+                        "default": False
                     }
                 },
                 "required": ["file"]
@@ -135,7 +614,7 @@ async def list_tools() -> List[Tool]:
                 "properties": {
                     "file": {
                         "type": "string",
-                        "description": "Path to C/C++ file"
+                        "description": "Path to C/C++ file, or a goto-binary (.gb/.goto) built by goto-cc"
                     }
                 },
                 "required": ["file"]
@@ -149,7 +628,7 @@ async def list_tools() -> List[Tool]:
                 "properties": {
                     "file": {
                         "type": "string",
-                        "description": "Path to C/C++ file"
+                        "description": "Path to C/C++ file, or a goto-binary (.gb/.goto) built by goto-cc"
                     },
                     "function": {
                         "type": "string",
@@ -192,81 +671,209 @@ async def list_tools() -> List[Tool]:
         )
     ]
 
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> List[TextContent | ImageContent | EmbeddedResource]:
-    """Execute CBMC tools"""
+# Property kinds recognised in natural language verify queries, in report order
+_NL_PROPERTY_WORDS = (
+    ("bounds", frozenset({"bounds", "array", "arrays"})),
+    ("overflow", frozenset({"overflow", "overflows"})),
+    ("pointer", frozenset({"pointer", "pointers"})),
+    ("assertions", frozenset({"assert", "asserts", "assertion", "assertions"}))
+)
+
+# Natural-language intents, matched against whole words in this order of precedence
+_NL_EQUIV_WORDS = frozenset({"equivalence", "equivalent", "compare", "same"})
+_NL_VERIFY_WORDS = frozenset({"verify", "verification", "check", "assert", "asserts",
+                              "bounds", "overflow", "overflows"})
+_NL_SHOW_WORDS = frozenset({"show", "list", "properties", "assertions"})
+_NL_TEST_WORDS = frozenset({"test", "tests", "generate", "coverage"})
+_NL_FUNCTION_RE = re.compile(r"function\s+(\w+)|(\w+)\s+function", re.I)
+_RE_WORD = re.compile(r"\w+")
+
+# The checks behind property "all", one CBMC run each; user assertions are checked
+# by the first run only
+_ALL_PROPERTY_CHECKS = (
+    ("bounds", ["--bounds-check"]),
+    ("pointer", ["--pointer-check", "--no-assertions"]),
+    ("div-by-zero", ["--div-by-zero-check", "--no-assertions"]),
+    ("signed-overflow", ["--signed-overflow-check", "--no-assertions"]),
+    ("unsigned-overflow", ["--unsigned-overflow-check", "--no-assertions"])
+)
+
+def _verify_report(result: Dict[str, Any], trace: bool) -> str:
+    """The body of a verification result: the --json-ui summary or CBMC's own output"""
+    if "summary" in result:
+        return format_json_summary(result["summary"], trace)
+    return result.get('stdout', '')
+
+# "[main.overflow.1] line 3 arithmetic overflow on signed + in x + y: FAILURE"
+_RE_FAILED_PROPERTY = re.compile(r"^\[([^\]]+)\] .*: FAILURE$", re.M)
+
+def _first_failed_property(result: Dict[str, Any]) -> Optional[str]:
+    if "summary" in result:
+        failure = result["summary"]["first_failure"]
+        return failure.get("property") if failure else None
+    match = _RE_FAILED_PROPERTY.search(result.get('stdout', ''))
+    return match.group(1) if match else None
+
+async def run_traced_on_failure(args: List[str], trace: bool) -> Tuple[Dict[str, Any], str]:
+    """Run CBMC without --trace; on failure, re-run only the first failing property with it"""
+    result = await run_cbmc_command(args)
+    report = _verify_report(result, False)
     
-    if name == "cbmc_verify":
-        file_path = arguments["file"]
-        function = arguments.get("function", "main")
-        unwind = arguments.get("unwind", 10)
-        property = arguments.get("property", "all")
-        trace = arguments.get("trace", True)
-        
-        args = [file_path, f"--function={function}", f"--unwind={unwind}"]
-        
-        # Add property checks
-        if property == "all":
-            args.extend(["--bounds-check", "--pointer-check", "--div-by-zero-check", 
-                        "--signed-overflow-check", "--unsigned-overflow-check"])
-        elif property == "bounds":
-            args.append("--bounds-check")
-        elif property == "pointer":
-            args.append("--pointer-check")
-        elif property == "overflow":
-            args.extend(["--signed-overflow-check", "--unsigned-overflow-check"])
-        elif property == "div-by-zero":
-            args.append("--div-by-zero-check")
-        
-        if trace:
-            args.append("--trace")
+    # Counterexamples are only extracted for the one property that needs explaining
+    if trace and not result['success']:
+        property_id = _first_failed_property(result)
+        if property_id is not None:
+            traced = await run_cbmc_command(args + ["--trace", "--property", property_id])
+            report += f"\n\nCounterexample for {property_id}:\n{_verify_report(traced, True)}"
+    
+    return result, report
+
+async def verify_file(arguments: Dict[str, Any]) -> Tuple[bool, List[TextContent]]:
+    """Run cbmc_verify on one file and return whether it passed along with the report"""
+    async with goto_binary(arguments["file"]) as binary:
+        return await verify_binary(binary, arguments)
+
+async def verify_binary(binary: str, arguments: Dict[str, Any]) -> Tuple[bool, List[TextContent]]:
+    """verify_file on the file's goto-binary (or the file itself if it couldn't be built)"""
+    function = arguments.get("function", "main")
+    unwind = arguments.get("unwind", 10)
+    property = arguments.get("property", "all")
+    trace = arguments.get("trace", False)
+    
+    loop_unwinds = arguments.get("loop_unwinds") or {}
+    
+    args = [binary, f"--function={function}", f"--unwind={unwind}"]
+    
+    # Loops that need a large bound get it individually; the rest keep --unwind
+    for loop_id, bound in loop_unwinds.items():
+        args.extend(["--unwindset", f"{loop_id}:{int(bound)}"])
+    if arguments.get("partial_loops", False):
+        args.append("--partial-loops")
+    if arguments.get("unwinding_assertions", False):
+        args.append("--unwinding-assertions")
+    
+    # Structured output is summarised while streaming rather than relayed whole
+    output_args = ["--json-ui"] if await cbmc_supports_json_ui() else []
+    
+    # The first counterexample is enough: CBMC stops there, and sibling checks are cancelled
+    stop_on_failure = arguments.get("stop_on_failure", False)
+    if stop_on_failure:
+        output_args.append("--stop-on-fail")
+    
+    # Each check class is a separate, smaller CBMC problem; all of them run at once
+    if property == "all":
+        tasks = {
+            asyncio.create_task(run_traced_on_failure(args + flags + output_args, trace)): check
+            for check, flags in _ALL_PROPERTY_CHECKS
+        }
+        runs: Dict[str, Tuple[Dict[str, Any], str]] = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    runs[tasks[task]] = task.result()
+                if stop_on_failure and any(not result['success'] for result, _ in runs.values()):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
         
-        result = run_cbmc_command(args)
+        verdicts = {check: 'SUCCESS' if result['success'] else 'FAILED' for check, (result, _) in runs.items()}
+        summary = "\n".join(
+            f"  {check}: {verdicts.get(check, 'NOT CHECKED')}" for check, _ in _ALL_PROPERTY_CHECKS
+        )
+        sections = "\n".join(
+            f"--- {check} ---\n"
+            f"Command: {runs[check][0].get('command', 'N/A')}\n\n"
+            f"{runs[check][1]}\n"
+            f"{runs[check][0].get('stderr', '')}\n"
+            f"{runs[check][0].get('error', '')}"
+            for check, _ in _ALL_PROPERTY_CHECKS if check in runs
+        )
         
-        return [TextContent(
+        passed = len(runs) == len(_ALL_PROPERTY_CHECKS) and all(result['success'] for result, _ in runs.values())
+        return passed, [TextContent(
             type="text",
             text=f"CBMC Verification Results:\n\n"
-                 f"Command: {result.get('command', 'N/A')}\n\n"
-                 f"{'SUCCESS' if result['success'] else 'FAILED'}\n\n"
-                 f"{result.get('stdout', '')}\n"
-                 f"{result.get('stderr', '')}\n"
-                 f"{result.get('error', '')}"
+                 f"{'SUCCESS' if passed else 'FAILED'}\n\n"
+                 f"{summary}\n\n"
+                 f"{sections}"
         )]
     
+    # Add property checks
+    if property == "bounds":
+        args.append("--bounds-check")
+    elif property == "pointer":
+        args.append("--pointer-check")
+    elif property == "overflow":
+        args.extend(["--signed-overflow-check", "--unsigned-overflow-check"])
+    elif property == "div-by-zero":
+        args.append("--div-by-zero-check")
+    
+    result, report = await run_traced_on_failure(args + output_args, trace)
+    
+    return result['success'], [TextContent(
+        type="text",
+        text=f"CBMC Verification Results:\n\n"
+             f"Command: {result.get('command', 'N/A')}\n\n"
+             f"{'SUCCESS' if result['success'] else 'FAILED'}\n\n"
+             f"{report}\n"
+             f"{result.get('stderr', '')}\n"
+             f"{result.get('error', '')}"
+    )]
+
+@app.call_tool()
+async def call_tool(name: str, arguments: Any) -> List[TextContent | ImageContent | EmbeddedResource]:
+    """Execute CBMC tools"""
+    
+    if name == "cbmc_verify":
+        _, contents = await verify_file(arguments)
+        return contents
+    
     elif name == "cbmc_equivalence":
         file1 = arguments["file1"]
         file2 = arguments["file2"]
         function = arguments["function"]
         unwind = arguments.get("unwind", 10)
         inputs = arguments.get("inputs", [])
+        abs1 = os.path.abspath(file1)
+        abs2 = os.path.abspath(file2)
         
-        # Create equivalence checking harness
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.c', delete=False) as f:
-            harness_code = f"""
+        # Harnesses live in a directory named after everything that shapes them, so a
+        # repeated query finds its files already written
+        harness_key = hashlib.blake2b(
+            json.dumps([abs1, abs2, function, inputs]).encode(), digest_size=16
+        ).hexdigest()
+        harness_dir = HARNESS_DIR / harness_key
+        harness_dir.mkdir(parents=True, exist_ok=True)
+        os.utime(harness_dir)
+        
+        # Each implementation is compiled once, as its own translation unit with the
+        # function renamed, so the two definitions never collide
+        sources = []
+        for suffix, source in (("v1", abs1), ("v2", abs2)):
+            wrapper_path = harness_dir / f"{suffix}.c"
+            _write_once(wrapper_path, f'#define {function} {function}_{suffix}\n#include "{source}"\n')
+            sources.append(str(wrapper_path))
+        
+        harness_code = f"""
 #include <assert.h>
 
-// Include both implementations
-#include "{os.path.abspath(file1)}"
-#include "{os.path.abspath(file2)}"
-
-// Rename functions to avoid conflicts
-#define {function} {function}_v1
-#include "{os.path.abspath(file1)}"
-#undef {function}
-
-#define {function} {function}_v2
-#include "{os.path.abspath(file2)}"
-#undef {function}
+extern int {function}_v1();
+extern int {function}_v2();
 
 int main() {{
 """
-            
-            # Add non-deterministic inputs
-            for inp in inputs:
-                harness_code += f"    int {inp};\n"
-            
-            # Call both functions and compare
-            harness_code += f"""
+        
+        # Add non-deterministic inputs
+        for inp in inputs:
+            harness_code += f"    int {inp};\n"
+        
+        # Call both functions and compare
+        harness_code += f"""
     // Call both versions with same inputs
     int result1 = {function}_v1({', '.join(inputs)});
     int result2 = {function}_v2({', '.join(inputs)});
@@ -277,33 +884,35 @@ int main() {{
     return 0;
 }}
 """
-            f.write(harness_code)
-            harness_path = f.name
+        harness_path = harness_dir / "harness.c"
+        _write_once(harness_path, harness_code)
         
-        try:
-            args = [harness_path, "--unwind", str(unwind), "--trace"]
-            result = run_cbmc_command(args)
-            
-            equivalence = "EQUIVALENT" if result['success'] else "NOT EQUIVALENT"
-            
-            return [TextContent(
-                type="text",
-                text=f"Equivalence Checking Results:\n\n"
-                     f"Files: {file1} vs {file2}\n"
-                     f"Function: {function}\n"
-                     f"Result: {equivalence}\n\n"
-                     f"{result.get('stdout', '')}\n"
-                     f"{result.get('stderr', '')}\n"
-                     f"{result.get('error', '')}"
-            )]
-        finally:
-            os.unlink(harness_path)
+        args = [str(harness_path)] + sources + ["--unwind", str(unwind)]
+        result = await run_cbmc_command(args, inputs=[abs1, abs2])
+        
+        # The trace is only worth extracting once the functions are known to differ
+        if not result['success'] and "error" not in result:
+            result = await run_cbmc_command(args + ["--trace"], inputs=[abs1, abs2])
+        
+        equivalence = "EQUIVALENT" if result['success'] else "NOT EQUIVALENT"
+        
+        return [TextContent(
+            type="text",
+            text=f"Equivalence Checking Results:\n\n"
+                 f"Files: {file1} vs {file2}\n"
+                 f"Function: {function}\n"
+                 f"Result: {equivalence}\n\n"
+                 f"{result.get('stdout', '')}\n"
+                 f"{result.get('stderr', '')}\n"
+                 f"{result.get('error', '')}"
+        )]
     
     elif name == "cbmc_show_properties":
         file_path = arguments["file"]
-        args = [file_path, "--show-properties"]
         
-        result = run_cbmc_command(args)
+        # Repeat queries are answered by the result cache, keyed on the file and its headers
+        async with goto_binary(file_path) as binary:
+            result = await run_cbmc_command([binary, "--show-properties"])
         
         return [TextContent(
             type="text",
@@ -318,10 +927,27 @@ int main() {{
         function = arguments.get("function", "main")
         coverage = arguments.get("coverage", "branch")
         
-        args = [file_path, f"--function={function}", "--cover", coverage,
-                "--trace", "--xml-ui"]
+        # JSON output is both smaller and far cheaper to parse than --xml-ui
+        use_json = await cbmc_supports_json_ui()
+        async with goto_binary(file_path) as binary:
+            result = await run_cbmc_command([binary, f"--function={function}", "--cover", coverage,
+                                             "--trace", "--json-ui" if use_json else "--xml-ui"])
         
-        result = run_cbmc_command(args)
+        cover = result.get("summary")
+        if cover is not None:
+            covered = sum(1 for goal in cover["goals"] if goal.get("status") == "satisfied")
+            return [TextContent(
+                type="text",
+                text=f"Test Generation Results:\n\n"
+                     f"File: {file_path}\n"
+                     f"Function: {function}\n"
+                     f"Coverage: {coverage}\n"
+                     f"Goals covered: {covered}/{len(cover['goals'])}\n"
+                     f"Tests generated: {len(cover['tests'])}\n\n"
+                     f"{json.dumps({'goals': cover['goals'], 'tests': cover['tests']}, separators=(',', ':'))}\n"
+                     f"{result.get('stderr', '')}\n"
+                     f"{result.get('error', '')}"
+            )]
         
         return [TextContent(
             type="text",
@@ -340,14 +966,13 @@ int main() {{
         files = context.get("files", [])
         
         # Process natural language queries and invoke appropriate tools
-        query_lower = query.lower()
+        words = frozenset(_RE_WORD.findall(query.lower()))
         
         # Check for equivalence queries
-        if any(word in query_lower for word in ["equivalence", "equivalent", "compare", "same"]):
+        if words & _NL_EQUIV_WORDS:
             if len(files) >= 2:
                 # Extract function name from query if possible
-                import re
-                func_match = re.search(r'function\s+(\w+)|(\w+)\s+function', query_lower)
+                func_match = _NL_FUNCTION_RE.search(query)
                 function_name = func_match.group(1) or func_match.group(2) if func_match else "main"
                 
                 # Call equivalence tool
@@ -365,26 +990,35 @@ int main() {{
                 )]
         
         # Check for verification queries
-        elif any(word in query_lower for word in ["verify", "check", "assert", "bounds", "overflow"]):
+        elif words & _NL_VERIFY_WORDS:
             if files:
-                # Determine property type from query
-                property_type = "all"
-                if "bounds" in query_lower or "array" in query_lower:
-                    property_type = "bounds"
-                elif "overflow" in query_lower:
-                    property_type = "overflow"
-                elif "pointer" in query_lower:
-                    property_type = "pointer"
-                elif "assert" in query_lower:
-                    property_type = "assertions"
+                # Determine property types from query; each one mentioned gets its own run
+                property_types = [
+                    property_type for property_type, property_words in _NL_PROPERTY_WORDS
+                    if words & property_words
+                ] or ["all"]
                 
-                # Call verify tool
-                result = await call_tool("cbmc_verify", {
-                    "file": files[0],
-                    "property": property_type,
-                    "trace": True
-                })
-                return result
+                # One independent CBMC run per file and property, all in flight together
+                runs = [(file_path, property_type) for file_path in files for property_type in property_types]
+                results = await asyncio.gather(*(
+                    verify_file({
+                        "file": file_path,
+                        "property": property_type,
+                        "trace": True
+                    })
+                    for file_path, property_type in runs
+                ))
+                
+                # A summary first, then one content item per (file, property) run
+                passed = sum(1 for ok, _ in results if ok)
+                summary = f"Verified {len(runs)} file/property combinations: {passed} passed, {len(runs) - passed} failed\n"
+                summary += "".join(
+                    f"  {file_path} [{property_type}]: {'SUCCESS' if ok else 'FAILED'}\n"
+                    for (file_path, property_type), (ok, _) in zip(runs, results)
+                )
+                return [TextContent(type="text", text=summary)] + [
+                    content for _, contents in results for content in contents
+                ]
             else:
                 return [TextContent(
                     type="text",
@@ -392,7 +1026,7 @@ int main() {{
                 )]
         
         # Check for property listing queries
-        elif any(word in query_lower for word in ["show", "list", "properties", "assertions"]):
+        elif words & _NL_SHOW_WORDS:
             if files:
                 result = await call_tool("cbmc_show_properties", {
                     "file": files[0]
@@ -405,13 +1039,13 @@ int main() {{
                 )]
         
         # Check for test generation queries
-        elif any(word in query_lower for word in ["test", "generate", "coverage"]):
+        elif words & _NL_TEST_WORDS:
             if files:
                 # Determine coverage type
                 coverage = "branch"
-                if "condition" in query_lower:
+                if words & {"condition", "conditions"}:
                     coverage = "condition"
-                elif "path" in query_lower:
+                elif words & {"path", "paths"}:
                     coverage = "path"
                 
                 result = await call_tool("cbmc_generate_tests", {
@@ -445,6 +1079,9 @@ int main() {{
 
 async def main():
     """Run the CBMC MCP server"""
+    prune_harnesses()
+    prune_result_cache()
+    _prune_lru(GOTO_CACHE_DIR, "*.gb", GOTO_CACHE_ENTRIES)
     async with stdio_server() as (read_stream, write_stream):
         await app.run(read_stream, write_stream, {})
 
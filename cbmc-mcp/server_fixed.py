@@ -7,6 +7,7 @@ Provides tools for program verification and equivalence checking
 import asyncio
 import json
 import logging
+import reprlib
 import subprocess
 import tempfile
 import os
@@ -33,6 +34,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger("cbmc-mcp")
 
+class _ShortRepr:
+    """Log argument rendered as a truncated repr, and only if the record is emitted"""
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __str__(self) -> str:
+        return reprlib.repr(self.value)
+
 # Initialize MCP server
 logger.info("Initializing CBMC MCP server")
 server = Server("cbmc-mcp")
@@ -41,7 +51,8 @@ def run_cbmc_command(args: List[str], cwd: Optional[str] = None) -> Dict[str, An
     """Execute CBMC command and return results"""
     try:
         cmd = ["cbmc"] + args
-        logger.info(f"Running command: {' '.join(cmd)}")
+        command = ' '.join(cmd)
+        logger.info("Running command: %s", command)
         
         result = subprocess.run(
             cmd,
@@ -56,20 +67,20 @@ def run_cbmc_command(args: List[str], cwd: Optional[str] = None) -> Dict[str, An
             "stdout": result.stdout,
             "stderr": result.stderr,
             "returncode": result.returncode,
-            "command": ' '.join(cmd)
+            "command": command
         }
     except subprocess.TimeoutExpired:
         return {
             "success": False,
             "error": "Command timed out after 5 minutes",
-            "command": ' '.join(cmd)
+            "command": command
         }
     except Exception as e:
-        logger.error(f"Error running CBMC: {e}")
+        logger.error("Error running CBMC: %s", e)
         return {
             "success": False,
             "error": str(e),
-            "command": ' '.join(cmd)
+            "command": command
         }
 
 @server.list_tools()
@@ -148,7 +159,7 @@ async def list_tools() -> List[Tool]:
 @server.call_tool()
 async def call_tool(name: str, arguments: Any) -> List[TextContent | ImageContent | EmbeddedResource]:
     """Execute CBMC tools"""
-    logger.info(f"Calling tool: {name} with arguments: {arguments}")
+    logger.info("Calling tool: %s with arguments: %s", name, _ShortRepr(arguments))
     
     if name == "cbmc_verify":
         file_path = arguments.get("file")
@@ -201,24 +212,25 @@ async def call_tool(name: str, arguments: Any) -> List[TextContent | ImageConten
         unwind = arguments.get("unwind", 10)
         inputs = arguments.get("inputs", [])
         
-        # Create equivalence checking harness
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.c', delete=False) as f:
+        # The harness lives in a private directory that is removed on any exit,
+        # including cancellation of the CBMC run. Each implementation is its own
+        # translation unit with the function (and any main) renamed, so static
+        # helpers and unguarded headers present in both files no longer collide
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sources = []
+            for suffix, source in (("v1", file1), ("v2", file2)):
+                wrapper_path = os.path.join(tmpdir, f"{suffix}.c")
+                with open(wrapper_path, 'w') as f:
+                    f.write(f'#define {function} {function}_{suffix}\n')
+                    if function != "main":
+                        f.write(f'#define main main_{suffix}\n')
+                    f.write(f'#include "{os.path.abspath(source)}"\n')
+                sources.append(wrapper_path)
+            
             harness_code = f"""#include <assert.h>
 
-// Forward declarations
-int {function}(int);
-
-// Implementation 1
-#define IMPL1
-#include "{os.path.abspath(file1)}"
-#undef IMPL1
-int {function}_v1(int x) {{ return {function}(x); }}
-
-// Implementation 2  
-#define IMPL2
-#include "{os.path.abspath(file2)}"
-#undef IMPL2
-int {function}_v2(int x) {{ return {function}(x); }}
+extern int {function}_v1(int);
+extern int {function}_v2(int);
 
 int main() {{
     int x;  // Non-deterministic input
@@ -232,27 +244,25 @@ int main() {{
     return 0;
 }}
 """
-            f.write(harness_code)
-            harness_path = f.name
-        
-        try:
-            args = [harness_path, "--unwind", str(unwind), "--trace"]
-            result = run_cbmc_command(args)
-            
-            equivalence = "EQUIVALENT" if result['success'] else "NOT EQUIVALENT"
+            harness_path = os.path.join(tmpdir, "harness.c")
+            with open(harness_path, 'w') as f:
+                f.write(harness_code)
             
-            return [TextContent(
-                type="text",
-                text=f"Equivalence Checking Results:\n\n"
-                     f"Files: {file1} vs {file2}\n"
-                     f"Function: {function}\n"
-                     f"Result: {equivalence}\n\n"
-                     f"{result.get('stdout', '')}\n"
-                     f"{result.get('stderr', '')}\n"
-                     f"{result.get('error', '')}"
-            )]
-        finally:
-            os.unlink(harness_path)
+            args = [harness_path] + sources + ["--unwind", str(unwind), "--trace"]
+            result = run_cbmc_command(args)
+        
+        equivalence = "EQUIVALENT" if result['success'] else "NOT EQUIVALENT"
+        
+        return [TextContent(
+            type="text",
+            text=f"Equivalence Checking Results:\n\n"
+                 f"Files: {file1} vs {file2}\n"
+                 f"Function: {function}\n"
+                 f"Result: {equivalence}\n\n"
+                 f"{result.get('stdout', '')}\n"
+                 f"{result.get('stderr', '')}\n"
+                 f"{result.get('error', '')}"
+        )]
     
     else:
         return [TextContent(
@@ -275,7 +285,7 @@ async def main():
                 initialization_options={}
             )
         except Exception as e:
-            logger.error(f"Server error: {e}", exc_info=True)
+            logger.error("Server error: %s", e, exc_info=True)
             raise
 
 if __name__ == "__main__":
@@ -285,5 +295,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Server interrupted")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
\ No newline at end of file
@@ -2,58 +2,108 @@
 import pya
 import os
 import glob
+import argparse
+import multiprocessing
 
 # Configuration
 input_pattern = "*.gds"  # Change to match your input files
 output_format = "oas"    # Target format: oas, gds, dxf, cif
 scale_factor = 1.0       # Scaling factor (e.g., 0.001 to convert nm to um)
+rescale_coordinates = False  # Scale the shapes themselves instead of the database unit
+layer_filter = None      # Layers to keep, e.g. [(1, 0), (2, 0)]; None keeps all
 
-# Find all matching files
-input_files = glob.glob(input_pattern)
+# Bytes -> megabytes
+MB = 1.0 / (1024 * 1024)
 
-if not input_files:
-    print(f"No files found matching pattern: {input_pattern}")
-    exit(1)
+# Fixed for the whole batch, so worked out once
+output_suffix = "." + output_format
+report_compression = output_format == "oas"
 
-print(f"Found {len(input_files)} files to convert")
+# Reader options: with a layer filter, other layers are skipped while parsing
+load_options = pya.LoadLayoutOptions()
+if layer_filter is not None:
+    layer_map = pya.LayerMap()
+    for index, (layer, datatype) in enumerate(layer_filter):
+        layer_map.map(pya.LayerInfo(layer, datatype), index)
+    load_options.set_layer_map(layer_map, False)
 
-# Convert each file
-for input_file in input_files:
-    print(f"\nProcessing: {input_file}")
-    
+# Writer options: the format is set explicitly rather than guessed from the file
+# name, and the native writer streams cells straight to the output file
+save_options = pya.SaveLayoutOptions()
+save_options.format = {"oas": "OASIS", "gds": "GDS2", "dxf": "DXF", "cif": "CIF"}[output_format]
+
+def convert_one(input_file):
+    """Convert one file; returns (input_file, output_file, input_size, output_size, error)"""
+    # Load layout
+    layout = pya.Layout()
     try:
-        # Load layout
-        layout = pya.Layout()
-        layout.read(input_file)
+        layout.read(input_file, load_options)
         
-        # Apply scaling if needed
+        # Apply scaling if needed: a different database unit scales every coordinate
+        # at once, without rewriting any shape
         if scale_factor != 1.0:
-            trans = pya.DCplxTrans(scale_factor)
-            for cell in layout.each_cell():
-                cell.transform(trans)
-            print(f"  Applied scaling factor: {scale_factor}")
+            if rescale_coordinates:
+                trans = pya.DCplxTrans(scale_factor)
+                if hasattr(layout, "transform"):
+                    layout.transform(trans)
+                else:
+                    for cell_index in range(layout.cells()):
+                        layout.cell(cell_index).transform(trans)
+            else:
+                layout.dbu = layout.dbu * scale_factor
         
-        # Generate output filename
-        base_name = os.path.splitext(input_file)[0]
-        output_file = f"{base_name}.{output_format}"
+        # Generate output filename (input_pattern always matches an extension)
+        output_file = input_file.rpartition('.')[0] + output_suffix
         
         # Write output
-        layout.write(output_file)
-        print(f"  Created: {output_file}")
-        
-        # Report file sizes
-        input_size = os.path.getsize(input_file)
-        output_size = os.path.getsize(output_file)
+        layout.write(output_file, save_options)
         
-        if output_format == "oas":
-            compression = (1 - output_size/input_size) * 100
-            print(f"  Compression: {compression:.1f}%")
-        
-        print(f"  Input size: {input_size/1024/1024:.2f} MB")
-        print(f"  Output size: {output_size/1024/1024:.2f} MB")
+        return input_file, output_file, os.stat(input_file).st_size, os.stat(output_file).st_size, None
         
     except Exception as e:
-        print(f"  ERROR: {str(e)}")
-        continue
+        return input_file, None, 0, 0, str(e)
+    finally:
+        # Free the native layout now rather than whenever Python collects it, so
+        # memory peaks at the largest single file instead of growing over the batch
+        layout._destroy()
 
-print(f"\nConversion complete!")
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch-convert layout files with KLayout")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of files converted at once (default: one per CPU)")
+    args = parser.parse_args()
+    
+    # Find all matching files
+    input_files = glob.glob(input_pattern)
+    
+    if not input_files:
+        print(f"No files found matching pattern: {input_pattern}")
+        exit(1)
+    
+    print(f"Found {len(input_files)} files to convert")
+    
+    # Files are independent, so each worker converts one at a time; results are
+    # reported in completion order
+    with multiprocessing.Pool(max(1, min(args.jobs, len(input_files)))) as pool:
+        for input_file, output_file, input_size, output_size, error in pool.imap_unordered(convert_one, input_files):
+            # Each file's report goes out in a single write
+            lines = [f"\nProcessing: {input_file}"]
+            
+            if error is not None:
+                lines.append(f"  ERROR: {error}")
+            else:
+                if scale_factor != 1.0:
+                    lines.append(f"  Applied scaling factor: {scale_factor}")
+                lines.append(f"  Created: {output_file}")
+                
+                # Report file sizes
+                if report_compression:
+                    compression = (1 - output_size/input_size) * 100
+                    lines.append(f"  Compression: {compression:.1f}%")
+                
+                lines.append(f"  Input size: {input_size * MB:.2f} MB")
+                lines.append(f"  Output size: {output_size * MB:.2f} MB")
+            
+            print("\n".join(lines))
+    
+    print(f"\nConversion complete!")
\ No newline at end of file
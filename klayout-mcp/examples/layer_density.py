@@ -1,5 +1,46 @@
 # Example Python script for calculating layer density in KLayout
 import pya
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+def as_flag(value):
+    """A boolean script parameter; values given with -rd on the command line are strings"""
+    return str(value).lower() in ("1", "true", "yes")
+
+# Pass show_shape_count=False in the script parameters to leave out shape counts
+if 'show_shape_count' not in globals():
+    show_shape_count = True
+show_shape_count = as_flag(show_shape_count)
+
+# Pass jobs=N in the script parameters to limit the worker processes (default: one per CPU)
+if 'jobs' not in globals():
+    jobs = None
+
+# Pass hierarchical=True for layouts with heavy cell reuse: each cell's geometry is then
+# processed once and weighted by its instance count instead of being flattened
+if 'hierarchical' not in globals():
+    hierarchical = False
+hierarchical = as_flag(hierarchical)
+
+def analyze_layer(layer_index):
+    """Merged area (in dbu²) and, if requested, shape count of one layer below the top cell"""
+    # Flatten all shapes on this layer below the top cell; KLayout composes
+    # the instance transformations natively. A deep region keeps the hierarchy
+    # instead, and the store must outlive it
+    if hierarchical:
+        store = pya.DeepShapeStore()
+        region = pya.Region(top_cell.begin_shapes_rec(layer_index), store)
+    else:
+        region = pya.Region(top_cell.begin_shapes_rec(layer_index))
+    
+    # Overlapping shapes are counted once: area() merges internally instead of
+    # the region being rewritten with merge()
+    region.merged_semantics = True
+    
+    # Both come from the one region: count() is the number of raw shapes, which
+    # the region already holds, and needs no second pass over merged polygons
+    return region.area(), region.count() if show_shape_count else None
 
 # Access input file from parameters
 if 'input_files' in globals() and input_files:
@@ -18,41 +59,57 @@ if 'input_files' in globals() and input_files:
         print(f"Total chip area: {total_area:.2f} um²")
         print("-" * 50)
         
-        # Analyze each layer
-        layer_infos = layout.layer_infos()
-        for layer_info in layer_infos:
-            layer_index = layout.layer(layer_info.layer, layer_info.datatype)
+        # Layer area in um² -> percentage of the chip area
+        density_scale = 100 / total_area if total_area > 0 else 0
+        
+        # (info, index) for every layer, taken from the layer table directly rather
+        # than looking each index up again by layer/datatype
+        layers = [(layout.get_info(layer_index), layer_index) for layer_index in layout.layer_indexes()]
+        
+        # Layers are independent, so each one is merged in its own worker. Forked
+        # workers inherit the loaded layout and don't read the file again. The cell's
+        # per-layer bounding box is cached by KLayout, so layers without shapes below
+        # the top cell are never submitted. Fork isn't available on Windows and isn't
+        # safe under the macOS GUI; spawned workers wouldn't have the layout, so there
+        # the layers are analyzed one at a time in this process
+        if "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin":
+            executor = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("fork"))
+        else:
+            executor = ThreadPoolExecutor(max_workers=1)
+        with executor as pool:
+            futures = {
+                layer_index: pool.submit(analyze_layer, layer_index)
+                for _, layer_index in layers
+                if not top_cell.bbox(layer_index).empty()
+            }
             
-            # Create region from all shapes on this layer
-            region = pya.Region()
-            for cell in layout.each_cell():
-                trans = pya.ICplxTrans.from_dtrans(pya.DCplxTrans())
-                for inst in top_cell.each_inst():
-                    if inst.cell == cell:
-                        trans = inst.dcplx_trans
+            # Report each layer in layout order; the lines are written out in one go
+            report = []
+            for layer_info, layer_index in layers:
+                layer_name = f"Layer {layer_info.layer}/{layer_info.datatype}"
+                if layer_info.name:
+                    layer_name += f" ({layer_info.name})"
                 
-                for shape in cell.shapes(layer_index).each():
-                    if shape.is_polygon():
-                        poly = shape.polygon.transformed(trans)
-                        region.insert(poly)
-                    elif shape.is_box():
-                        box = shape.box.transformed(trans)
-                        region.insert(box)
-            
-            # Merge overlapping shapes
-            region.merge()
-            
-            # Calculate area
-            layer_area = region.area() / 1e6  # Convert to um²
-            density = (layer_area / total_area) * 100 if total_area > 0 else 0
-            
-            layer_name = f"Layer {layer_info.layer}/{layer_info.datatype}"
-            if layer_info.name:
-                layer_name += f" ({layer_info.name})"
-            
-            print(f"{layer_name}:")
-            print(f"  Area: {layer_area:.2f} um²")
-            print(f"  Density: {density:.2f}%")
-            print(f"  Shape count: {region.count()}")
+                if layer_index not in futures:
+                    report.append(f"{layer_name}:")
+                    report.append("  Area: 0.00 um²")
+                    report.append("  Density: 0.00%")
+                    if show_shape_count:
+                        report.append("  Shape count: 0")
+                    continue
+                
+                # Calculate area
+                area, shape_count = futures[layer_index].result()
+                layer_area = area / 1e6  # Convert to um²
+                density = layer_area * density_scale
+                
+                report.append(f"{layer_name}:")
+                report.append(f"  Area: {layer_area:.2f} um²")
+                report.append(f"  Density: {density:.2f}%")
+                if show_shape_count:
+                    report.append(f"  Shape count: {shape_count}")
+        
+        if report:
+            print("\n".join(report))
 else:
     print("No input file provided. Use 'inputFiles' parameter.")
\ No newline at end of file
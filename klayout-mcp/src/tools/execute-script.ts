@@ -104,10 +104,10 @@ import pya
 import sys
 import json
 
-# Injected parameters
-input_files = ${JSON.stringify(inputFiles || [])}
-output_file = "${outputFile || ''}"
-parameters = ${JSON.stringify(parameters || {})}
+# Injected parameters, decoded from JSON so true/false/null become Python values
+input_files = json.loads(${JSON.stringify(JSON.stringify(inputFiles || []))})
+output_file = json.loads(${JSON.stringify(JSON.stringify(outputFile || ''))})
+parameters = json.loads(${JSON.stringify(JSON.stringify(parameters || {}))})
 
 # Make parameters available as individual variables
 for key, value in parameters.items():